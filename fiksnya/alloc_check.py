@@ -0,0 +1,124 @@
+import os
+import sys
+import json
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import game
+from simulation import SIM_STEP, KEY_BACKSPACE
+from analytics import percentile
+
+# Cek anggaran alokasi frame PLAY yang sudah stabil: gagal (exit 1) kalau rata-rata alokasi per frame melewati batas.
+# Bot mengetik meteor terbawah supaya jalur hit, ledakan, floating text & statistik ikut teruji.
+
+CHECK_SEED = 4321
+TYPE_EVERY = 4
+
+def bot_key(g, frame):
+    if frame % TYPE_EVERY:
+        return None
+    target = None
+    for meteor in g.sim.meteors:
+        if target is None or meteor.y > target.y:
+            target = meteor
+    if target is None:
+        return None
+    typed = g.sim.targets.buffer
+    if not target.text.startswith(typed):
+        return KEY_BACKSPACE
+    if len(typed) < len(target.text):
+        return target.text[len(typed)]
+    return None
+
+def play_frame(g, frame):
+    g.data.heal(100)
+    key = bot_key(g, frame)
+    if key:
+        g.press(key)
+        g.apply_sim_events()
+    g.run_frame(SIM_STEP)
+
+def measure(g, frames, warmup):
+    g.start_game(seed=CHECK_SEED)
+    # Warmup: cache teks, sheet glyph, pool entity & surface kata terisi dulu
+    for frame in range(warmup):
+        play_frame(g, frame)
+
+    alloc = g.alloc_profiler
+    alloc.reset()
+    alloc.start()
+    for frame in range(warmup, warmup + frames):
+        play_frame(g, frame)
+    alloc.stop()
+
+    trace = list(alloc.trace)
+    peaks = sorted(row[4] for row in trace)
+    return {
+        "frames": len(trace),
+        "state": trace[-1][1] if trace else None,
+        "bytes_per_frame": sum(row[2] for row in trace) / len(trace),
+        "blocks_per_frame": sum(row[3] for row in trace) / len(trace),
+        "peak_p95": percentile(peaks, 95),
+        "hits": g.sim.hits,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail when steady-state PLAY frames allocate more than a budget")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=600)
+    parser.add_argument("--video", choices=["on", "off"], default="on")
+    parser.add_argument("--max-bytes", type=float, default=2048, help="budget: bytes still alive at frame end, mean per frame")
+    parser.add_argument("--max-blocks", type=float, default=16, help="budget: allocated blocks still alive at frame end, mean per frame")
+    parser.add_argument("--max-peak", type=int, default=64 * 1024, help="budget: p95 of the in-frame allocation peak in bytes")
+    parser.add_argument("--top", type=int, default=10, help="source lines to list")
+    parser.add_argument("--out", help="write the result and top source lines as JSON")
+    args = parser.parse_args()
+
+    g = game.CyberTyperGame()
+    g.assets_ready.wait()
+    g.record_replays = False
+    g.governor.enabled = False
+    if args.video == "off":
+        g.video_bg.close()
+    elif g.video_bg.mode == "decode":
+        # Decoder thread yang masih menulis cache ikut ter-trace; hasil harus sama dengan atau tanpa cache lama
+        print("[ALLOC] Building video frame cache before measuring...")
+        if not g.video_bg.wait_for_cache():
+            print("[WARNING] Video frame cache unavailable, live decoding is included in the measurement")
+
+    result = measure(g, args.frames, args.warmup)
+    result["background"] = g.video_bg.mode
+    print(f"[ALLOC] {result['frames']} PLAY frames after {args.warmup} warmup ({result['hits']} words hit, "
+          f"background: {result['background']})")
+    g.alloc_profiler.report(args.top)
+    print(f"[ALLOC] p95 in-frame peak {result['peak_p95']} B")
+
+    if args.out:
+        lines = [{"file": os.path.basename(fn), "line": ln, "bytes": s, "blocks": c, "frames": h}
+                 for (fn, ln), (s, c, h) in g.alloc_profiler.top_lines(args.top)]
+        with open(args.out, "w") as f:
+            json.dump({"result": result, "lines": lines}, f, indent=2)
+        print(f"[ALLOC] Result saved: {args.out}")
+
+    g.video_bg.close()
+    pygame.quit()
+
+    failures = []
+    if result["state"] != "PLAY":
+        failures.append(f"game left PLAY (state {result['state']})")
+    if result["bytes_per_frame"] > args.max_bytes:
+        failures.append(f"{result['bytes_per_frame']:.0f} B/frame > {args.max_bytes:.0f}")
+    if result["blocks_per_frame"] > args.max_blocks:
+        failures.append(f"{result['blocks_per_frame']:.1f} blocks/frame > {args.max_blocks:.1f}")
+    if result["peak_p95"] > args.max_peak:
+        failures.append(f"peak p95 {result['peak_p95']} B > {args.max_peak}")
+    if failures:
+        print(f"[ALLOC] Over budget: {'; '.join(failures)}")
+        sys.exit(1)
+    print("[ALLOC] Within budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import heapq
+
+# Statistik cara mengetik, semua agregatornya berukuran tetap: memori sama untuk sesi 1 menit maupun 5 jam
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+WPM_WINDOW = 60
+MAX_WORD_LENGTH = 16
+SLOWEST_WORDS = 5
+
+def percentile(sorted_values, pct):
+    # Nearest-rank pada list yang sudah urut (dipakai benchmark.py, sweep.py, alloc_check.py)
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class Histogram:
+    # Bin selebar bin_size sampai max_value, nilai di atasnya masuk bin overflow
+    def __init__(self, bin_size=1.0, max_value=100):
+        self.bin_size = bin_size
+        self.counts = [0] * (int(max_value / bin_size) + 1)
+        self.total = 0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[min(len(self.counts) - 1, int(value / self.bin_size))] += 1
+        self.total += 1
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct):
+        if self.total == 0:
+            return 0.0
+        rank = pct / 100.0 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min((i + 1) * self.bin_size, self.max)
+        return self.max
+
+class RunningStats:
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+class RollingWPM:
+    # Ring buffer per detik: karakter benar dalam WPM_WINDOW detik terakhir
+    def __init__(self, window=WPM_WINDOW):
+        self.window = window
+        self.buckets = [0] * window
+        self.seconds = [-1] * window
+        self.peak = 0.0
+
+    def add(self, t):
+        second = int(t)
+        i = second % self.window
+        if self.seconds[i] != second:
+            self.seconds[i] = second
+            self.buckets[i] = 0
+        self.buckets[i] += 1
+
+    def wpm(self, t):
+        # t = detik sejak tombol pertama
+        now = int(t)
+        chars = sum(count for count, second in zip(self.buckets, self.seconds) if now - second < self.window)
+        minutes = min(t, self.window) / 60.0
+        if minutes < 5 / 60.0:
+            return 0.0
+        value = chars / 5.0 / minutes
+        if value > self.peak:
+            self.peak = value
+        return value
+
+class TypingAnalytics:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.start = None
+        self.last_key = None
+        self.last_time = 0.0
+        self.correct = 0
+        self.wrong = 0
+        self.backspaces = 0
+        self.key_total = [0] * len(LETTERS)
+        self.key_correct = [0] * len(LETTERS)
+        # Jeda antar tombol, bin 10 ms sampai 2 detik
+        self.interkey = Histogram(10.0, 2000)
+        self.rolling = RollingWPM()
+        self.word_started = None
+        self.word_times = RunningStats()
+        self.word_by_length = [RunningStats() for _ in range(MAX_WORD_LENGTH + 1)]
+        # min-heap (detik, kata) berisi SLOWEST_WORDS kata paling lama
+        self.slowest = []
+
+    def key(self, t, ch, correct):
+        if self.start is None:
+            self.start = t
+        if self.last_key is not None:
+            self.interkey.add((t - self.last_key) * 1000.0)
+        self.last_key = t
+        self.last_time = t
+
+        index = ord(ch) - 97
+        if 0 <= index < len(LETTERS):
+            self.key_total[index] += 1
+            if correct:
+                self.key_correct[index] += 1
+        if correct:
+            self.correct += 1
+            self.rolling.add(t - self.start)
+            if self.word_started is None:
+                self.word_started = t
+            if self.correct % 10 == 0:
+                self.rolling.wpm(t - self.start)
+        else:
+            self.wrong += 1
+
+    def backspace(self, t):
+        self.backspaces += 1
+        self.last_time = t
+
+    def abandon_word(self):
+        self.word_started = None
+
+    def word(self, t, text):
+        if self.word_started is None:
+            return
+        seconds = t - self.word_started
+        self.word_started = None
+        self.word_times.add(seconds)
+        self.word_by_length[min(len(text), MAX_WORD_LENGTH)].add(seconds)
+        entry = (seconds, text)
+        if len(self.slowest) < SLOWEST_WORDS:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def key_accuracy(self, min_samples=3):
+        return {LETTERS[i]: self.key_correct[i] / total
+                for i, total in enumerate(self.key_total) if total >= min_samples}
+
+    def summary(self):
+        elapsed = (self.last_time - self.start) if self.start is not None else 0.0
+        typed = self.correct + self.wrong
+        per_key = self.key_accuracy()
+        weakest = sorted(per_key.items(), key=lambda kv: (kv[1], kv[0]))[:3]
+        self.rolling.wpm(elapsed)
+        return {
+            "wpm": self.correct / 5.0 / (elapsed / 60.0) if elapsed > 0 else 0.0,
+            "peak_wpm": self.rolling.peak,
+            "accuracy": self.correct / typed if typed else 1.0,
+            "keys": typed,
+            "backspaces": self.backspaces,
+            "interkey_p50_ms": self.interkey.percentile(50),
+            "interkey_p90_ms": self.interkey.percentile(90),
+            "words": self.word_times.count,
+            "word_time_avg": self.word_times.mean,
+            "word_time_by_length": {n: round(s.mean, 3) for n, s in enumerate(self.word_by_length) if s.count},
+            "slowest_words": [[text, round(seconds, 2)] for seconds, text in sorted(self.slowest, reverse=True)],
+            "weakest_keys": [[k, round(acc, 3)] for k, acc in weakest if acc < 1.0],
+        }
@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import game
+from simulation import SIM_STEP
+from replay import Replay
+from analytics import percentile
+
+# Skenario benchmark frame loop, tiap frame = tepat satu tick simulasi
+
+BENCH_SEED = 1234
+
+def setup_menu(g):
+    g.state = "MENU"
+
+def setup_heavy_play(g):
+    g.start_game(seed=BENCH_SEED)
+    g.sim.level_manager.level = 15
+    for i in range(50):
+        meteor = g.sim.spawn_meteor()
+        meteor.y = meteor.prev_y = -60 + i * 12
+
+def tick_heavy_play(g, frame):
+    g.data.heal(100)
+    g.sim.spawn_timer = 0
+    for meteor in g.sim.meteors:
+        if meteor.y > game.HEIGHT - 80:
+            meteor.y = meteor.prev_y = -60
+    while len(g.sim.meteors) < 50:
+        g.sim.spawn_meteor()
+
+def setup_particles(g):
+    g.start_game(seed=BENCH_SEED)
+
+def tick_particles(g, frame):
+    g.data.heal(100)
+    g.sim.spawn_timer = 0
+    for _ in range(5):
+        g.spawn_particles(random.randint(0, game.WIDTH), random.randint(0, game.HEIGHT), game.C_NEON_CYAN)
+
+SCENARIOS = {
+    "menu_idle": (setup_menu, None),
+    "play_level15_50_meteors": (setup_heavy_play, tick_heavy_play),
+    "particle_storm": (setup_particles, tick_particles),
+}
+
+def prepare_video(g):
+    # Diukur selalu jalur steady state: cache frame dibangun dulu kalau belum ada, bukan decode + tulis cache
+    if g.video_bg.mode == "decode":
+        print("[BENCH] Building video frame cache before timing...")
+        if not g.video_bg.wait_for_cache():
+            print("[WARNING] Video frame cache unavailable, measuring live decoding")
+    return g.video_bg.mode
+
+def run_scenario(g, name, frames, warmup):
+    setup, tick = SCENARIOS[name]
+    random.seed(BENCH_SEED)
+    g.replay = None
+    setup(g)
+
+    times = []
+    for frame in range(warmup + frames):
+        if tick:
+            tick(g, frame)
+        start = time.perf_counter()
+        g.run_frame(SIM_STEP)
+        elapsed = time.perf_counter() - start
+        if frame >= warmup:
+            times.append(elapsed * 1000.0)
+
+    times.sort()
+    total = sum(times)
+    return {
+        "frames": frames,
+        "mean_ms": total / frames,
+        "p50_ms": percentile(times, 50),
+        "p95_ms": percentile(times, 95),
+        "p99_ms": percentile(times, 99),
+        "fps": frames / (total / 1000.0),
+    }
+
+def print_results(results, baseline=None):
+    print(f"{'scenario':<36}{'p50':>8}{'p95':>8}{'p99':>8}{'fps':>9}")
+    for key, r in results.items():
+        line = f"{key:<36}{r['p50_ms']:>8.2f}{r['p95_ms']:>8.2f}{r['p99_ms']:>8.2f}{r['fps']:>9.0f}"
+        if baseline and key in baseline:
+            delta = (r["p95_ms"] - baseline[key]["p95_ms"]) / baseline[key]["p95_ms"] * 100
+            line += f"   p95 {delta:+.1f}%"
+        print(line)
+
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for key, r in results.items():
+        if key in baseline and r["p95_ms"] > baseline[key]["p95_ms"] * (1 + tolerance / 100.0):
+            regressions.append(key)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="CYBER TYPER frame loop benchmark")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only these scenarios")
+    parser.add_argument("--video", choices=["on", "off", "both"], default="both")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="compare against a saved JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed p95 regression in percent")
+    parser.add_argument("--replay", help="add a scenario that plays back a recorded session")
+    args = parser.parse_args()
+
+    if args.replay:
+        replay = Replay(args.replay)
+        def setup_replay(g):
+            g.replay = replay
+            g.start_game()
+        SCENARIOS["replay"] = (setup_replay, None)
+
+    names = (args.scenario or list(SCENARIOS)) + (["replay"] if args.replay else [])
+    video_modes = ["on", "off"] if args.video == "both" else [args.video]
+
+    g = game.CyberTyperGame()
+    g.assets_ready.wait()
+    g.record_replays = False
+    g.governor.enabled = False
+    results = {}
+    for mode in video_modes:
+        if mode == "off":
+            g.video_bg.close()
+        background = prepare_video(g) if mode == "on" else "off"
+        for name in names:
+            key = f"{name}[video={mode}]"
+            results[key] = run_scenario(g, name, args.frames, args.warmup)
+            results[key]["background"] = background
+            print(f"[BENCH] {key} done (background: {background})")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+        for key, r in results.items():
+            # Baseline lama belum mencatat jalur video; anggap sama
+            recorded = baseline.get(key, {}).get("background", r["background"])
+            if recorded != r["background"]:
+                print(f"[WARNING] {key}: baseline measured background '{recorded}', this run '{r['background']}'")
+
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"created": time.strftime("%Y-%m-%d %H:%M:%S"), "results": results}, f, indent=2)
+        print(f"[BENCH] Baseline saved: {args.save}")
+
+    g.video_bg.close()
+    pygame.quit()
+
+    if baseline:
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print(f"[BENCH] p95 regression over {args.tolerance}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
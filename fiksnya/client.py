@@ -0,0 +1,142 @@
+import asyncio
+import argparse
+
+import pygame
+from game import Meteor, TEXT_CACHE, WIDTH, HEIGHT, FPS, C_BG, C_GRID, C_TEXT_MAIN, C_NEON_CYAN, C_NEON_GREEN, C_NEON_YELLOW, C_ERROR, C_GRAY
+from server import MirrorClient, DEFAULT_PORT, MSG_JOIN, MSG_KEY, MSG_WELCOME, frame, meteor_y, read_message
+from simulation import KEY_BACKSPACE, KEY_ENTER
+
+# Client pygame tipis untuk server.py: semua logika di server, client cuma kirim tombol dan menggambar
+
+class NetClient:
+    def __init__(self, host, port, name):
+        self.host = host
+        self.port = port
+        self.name = name
+        self.mirror = MirrorClient()
+        self.meteors = {}
+        self.writer = None
+        self.connected = False
+        self.running = True
+
+    async def connect(self):
+        reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.connected = True
+        self.join()
+        asyncio.ensure_future(self.receive(reader))
+
+    def join(self):
+        self.writer.write(frame(bytes([MSG_JOIN]) + self.name.encode("utf-8")))
+
+    def send_key(self, key):
+        if self.connected and self.mirror.result is None:
+            self.writer.write(frame(bytes([MSG_KEY]) + key.encode("utf-8")))
+
+    async def receive(self, reader):
+        try:
+            while True:
+                kind = self.mirror.handle(await read_message(reader))
+                if kind == MSG_WELCOME:
+                    self.meteors.clear()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            print("[CLIENT] Disconnected from server")
+        self.connected = False
+
+    def sync_meteors(self):
+        # Objek Meteor dari game.py dipakai ulang supaya tampilannya sama dengan mode single player
+        live = self.mirror.meteors
+        for meteor_id in [m for m in self.meteors if m not in live]:
+            del self.meteors[meteor_id]
+        tick = self.mirror.current_tick()
+        buffer = self.mirror.buffer
+        for meteor_id, (word, x, speed, spawn_tick) in live.items():
+            meteor = self.meteors.get(meteor_id)
+            if meteor is None:
+                meteor = Meteor(word, x, speed)
+                self.meteors[meteor_id] = meteor
+            meteor.y = meteor.prev_y = meteor_y(spawn_tick, speed, tick)
+            meteor.set_highlight(bool(buffer) and word.startswith(buffer))
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.running = False
+            elif self.mirror.result is not None:
+                if event.key == pygame.K_RETURN and self.connected:
+                    self.join()
+            elif event.key == pygame.K_RETURN:
+                self.send_key(KEY_ENTER)
+            elif event.key == pygame.K_BACKSPACE:
+                self.send_key(KEY_BACKSPACE)
+            elif event.unicode.isalpha():
+                self.send_key(event.unicode.lower())
+
+    def render(self, screen):
+        mirror = self.mirror
+        screen.fill(C_BG)
+        typed = len(mirror.buffer)
+        for meteor in self.meteors.values():
+            meteor.draw(screen, (0, 0), 1.0, typed)
+
+        pygame.draw.rect(screen, (50, 0, 0), (20, 20, 200, 20))
+        pygame.draw.rect(screen, C_ERROR, (20, 20, 2 * max(0, mirror.health), 20))
+        pygame.draw.rect(screen, (200, 200, 200), (20, 20, 200, 20), 2)
+        screen.blit(TEXT_CACHE.render(f"SCORE: {mirror.score}", 36, C_TEXT_MAIN), (WIDTH - 180, 20))
+        screen.blit(TEXT_CACHE.render(f"LEVEL: {mirror.level}", 36, C_NEON_GREEN), (WIDTH - 180, 50))
+        screen.blit(TEXT_CACHE.render(f"STREAK: {mirror.streak}", 36, C_NEON_YELLOW if mirror.streak > 0 else C_GRAY), (WIDTH - 180, 80))
+        screen.blit(TEXT_CACHE.render(f"ROUND {mirror.round_id}", 24, C_GRAY), (20, 50))
+
+        pygame.draw.rect(screen, C_GRID, (0, HEIGHT - 60, WIDTH, 60))
+        input_surf = TEXT_CACHE.render(f"> {mirror.buffer}_", 50, C_NEON_CYAN)
+        screen.blit(input_surf, (WIDTH // 2 - input_surf.get_width() // 2, HEIGHT - 50))
+
+        lines = []
+        if not self.connected:
+            lines = [("DISCONNECTED", C_ERROR)]
+        elif mirror.result is not None:
+            r = mirror.result
+            lines = [("GAME OVER", C_ERROR), (f"Score {r['score']}  -  rank {r['rank']} of {r['finished']} in round", C_TEXT_MAIN),
+                     ("Press ENTER to play again", C_NEON_CYAN)]
+        for i, (text, color) in enumerate(lines):
+            surf = TEXT_CACHE.render(text, 50 if i == 0 else 36, color)
+            screen.blit(surf, (WIDTH // 2 - surf.get_width() // 2, 260 + i * 60))
+
+async def run_client(host, port, name):
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(f"CYBER TYPER - {host}:{port}")
+    client = NetClient(host, port, name)
+    try:
+        await client.connect()
+    except OSError as e:
+        print(f"[CLIENT] Cannot connect to {host}:{port}: {e}")
+        pygame.quit()
+        return
+
+    loop = asyncio.get_running_loop()
+    frame_time = 1.0 / FPS
+    while client.running:
+        start = loop.time()
+        for event in pygame.event.get():
+            client.handle_event(event)
+        client.sync_meteors()
+        client.render(screen)
+        pygame.display.flip()
+        # Sisa waktu frame dipakai event loop untuk menerima pesan dari server
+        await asyncio.sleep(max(0.0, frame_time - (loop.time() - start)))
+
+    client.writer.close()
+    pygame.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description="CYBER TYPER network client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--name", default="player")
+    args = parser.parse_args()
+    asyncio.run(run_client(args.host, args.port, args.name))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import os
+import math
+import mmap
+import time
+import zlib
+import struct
+import random
+import argparse
+
+# Kamus kata untuk meteor: file ter-index + memory-map, kata dikelompokkan per tingkat kesulitan
+
+# Frekuensi huruf bahasa Inggris (%), dasar skor kelangkaan huruf
+LETTER_FREQ = {
+    "e": 12.7, "t": 9.1, "a": 8.2, "o": 7.5, "i": 7.0, "n": 6.7, "s": 6.3, "h": 6.1, "r": 6.0,
+    "d": 4.3, "l": 4.0, "c": 2.8, "u": 2.8, "m": 2.4, "w": 2.4, "f": 2.2, "g": 2.0, "y": 2.0,
+    "p": 1.9, "b": 1.5, "v": 1.0, "k": 0.8, "j": 0.15, "x": 0.15, "q": 0.1, "z": 0.07,
+}
+LETTER_RARITY = {ch: -math.log2(freq / 100.0) for ch, freq in LETTER_FREQ.items()}
+
+MIN_LENGTH = 3
+MAX_LENGTH_BAND = 12
+RARITY_BANDS = (4.3, 5.0)
+TIERS = MAX_LENGTH_BAND + len(RARITY_BANDS) + 1
+
+# Level L memakai tier [L+1-TIER_WINDOW, L+1], diperlebar sampai minimal MIN_BUCKET kata
+TIER_WINDOW = 3
+MIN_BUCKET = 8
+MAX_LEVEL = 64
+
+# Berapa kali mencoba cari kata yang huruf depannya belum dipakai meteor di layar
+PICK_ATTEMPTS = 8
+
+def normalize(word):
+    word = word.strip().lower()
+    if len(word) < MIN_LENGTH or not word.isascii() or not word.isalpha():
+        return None
+    return word
+
+def letter_rarity(word):
+    return sum(LETTER_RARITY[ch] for ch in word) / len(word)
+
+def word_tier(word):
+    length_band = min(MAX_LENGTH_BAND, len(word) - MIN_LENGTH)
+    rarity = letter_rarity(word)
+    rarity_band = sum(1 for limit in RARITY_BANDS if rarity >= limit)
+    return length_band + rarity_band
+
+class WordDictionary:
+    MAGIC = b"CTWD"
+    VERSION = 1
+    # magic, versi, jumlah tier, jumlah kata
+    HEADER = struct.Struct("<4sHHI")
+
+    def __init__(self, buffer, source=None):
+        self.source = source
+        self.view = memoryview(buffer)
+        magic, version, tiers, count = self.HEADER.unpack_from(self.view, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"not a word dictionary: {source}")
+        self.tiers = tiers
+        self.count = count
+        if count == 0:
+            raise ValueError(f"word dictionary is empty: {source}")
+
+        pos = self.HEADER.size
+        self.tier_starts = struct.unpack_from(f"<{tiers + 1}I", self.view, pos)
+        pos += (tiers + 1) * 4
+        self.offsets_pos = pos
+        self.blob_pos = pos + (count + 1) * 4
+        self.level_ranges = self._build_level_ranges()
+        self._checksum = None
+
+    @classmethod
+    def load(cls, filepath):
+        with open(filepath, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, source=filepath)
+
+    @classmethod
+    def from_words(cls, words):
+        return cls(pack_words(words), source="<memory>")
+
+    def close(self):
+        obj = self.view.obj
+        self.view.release()
+        if isinstance(obj, mmap.mmap):
+            obj.close()
+
+    def __len__(self):
+        return self.count
+
+    def checksum(self):
+        # Dipakai rekaman replay untuk memastikan kamusnya sama
+        if self._checksum is None:
+            self._checksum = zlib.crc32(self.view)
+        return self._checksum
+
+    def word(self, index):
+        start, end = struct.unpack_from("<II", self.view, self.offsets_pos + index * 4)
+        return str(self.view[self.blob_pos + start:self.blob_pos + end], "ascii")
+
+    def tier_size(self, tier):
+        return self.tier_starts[tier + 1] - self.tier_starts[tier]
+
+    def _build_level_ranges(self):
+        # Dihitung sekali saat load; pick() tinggal ambil range dari tabel
+        ranges = [None]
+        for level in range(1, MAX_LEVEL + 1):
+            hi = min(self.tiers - 1, level + 1)
+            lo = max(0, hi - TIER_WINDOW + 1)
+            while self.tier_starts[hi + 1] - self.tier_starts[lo] < MIN_BUCKET:
+                if lo > 0:
+                    lo -= 1
+                elif hi < self.tiers - 1:
+                    hi += 1
+                else:
+                    break
+            ranges.append((self.tier_starts[lo], self.tier_starts[hi + 1]))
+        return ranges
+
+    def bucket(self, level):
+        return self.level_ranges[max(1, min(level, MAX_LEVEL))]
+
+    def pick(self, level, rng, blocked=None):
+        # blocked: huruf depan yang sedang dipakai meteor lain (biar ketikan tidak nyangkut ke dua target)
+        start, end = self.bucket(level)
+        word = None
+        for _ in range(PICK_ATTEMPTS):
+            word = self.word(rng.randrange(start, end))
+            if not blocked or word[0] not in blocked:
+                return word
+        return word
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.word(i)
+
+def pack_words(words):
+    unique = {}
+    for word in words:
+        word = normalize(word)
+        if word and word not in unique:
+            unique[word] = word_tier(word)
+
+    if not unique:
+        # WordDictionary menolak kamus kosong; gagal di sini, bukan saat game dibuka
+        raise ValueError(f"no usable words (ASCII letters only, at least {MIN_LENGTH} long)")
+
+    ordered = sorted(unique, key=lambda w: (unique[w], w))
+    tier_starts = [0] * (TIERS + 1)
+    for word in ordered:
+        tier_starts[unique[word] + 1] += 1
+    for tier in range(TIERS):
+        tier_starts[tier + 1] += tier_starts[tier]
+
+    offsets = [0]
+    for word in ordered:
+        offsets.append(offsets[-1] + len(word))
+
+    return b"".join([
+        WordDictionary.HEADER.pack(WordDictionary.MAGIC, WordDictionary.VERSION, TIERS, len(ordered)),
+        struct.pack(f"<{TIERS + 1}I", *tier_starts),
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        "".join(ordered).encode("ascii"),
+    ])
+
+def build_dictionary(source_path, out_path):
+    with open(source_path, "r", encoding="utf-8", errors="ignore") as f:
+        data = pack_words(f)
+    with open(out_path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(out_path + ".tmp", out_path)
+    return out_path
+
+def main():
+    parser = argparse.ArgumentParser(description="CYBER TYPER word dictionary")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="pack a text word list (one word per line) into an indexed dictionary")
+    build.add_argument("source")
+    build.add_argument("-o", "--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.dict"))
+    stats = sub.add_parser("stats", help="show tier sizes and sample words per level")
+    stats.add_argument("path", nargs="?", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.dict"))
+    stats.add_argument("--levels", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        try:
+            build_dictionary(args.source, args.output)
+        except ValueError as e:
+            print(f"[ERROR] Cannot build {args.output}: {e}")
+            raise SystemExit(1)
+        print(f"[DICT] Built {args.output} in {time.perf_counter() - start:.2f}s ({os.path.getsize(args.output) // 1024} KB)")
+        return
+
+    start = time.perf_counter()
+    dictionary = WordDictionary.load(args.path)
+    print(f"[DICT] {len(dictionary)} words loaded in {(time.perf_counter() - start) * 1000:.2f} ms")
+    print("[DICT] tiers: " + " ".join(str(dictionary.tier_size(t)) for t in range(dictionary.tiers)))
+    rng = random.Random(0)
+    for level in range(1, args.levels + 1):
+        start, end = dictionary.bucket(level)
+        sample = ", ".join(dictionary.pick(level, rng) for _ in range(5))
+        print(f"[DICT] level {level:>2}: {end - start:>6} words  {sample}")
+    dictionary.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,53 @@
+import time
+BOOT_START = time.perf_counter()
+
 import pygame
 import random
 import sys
+import io
 import json
-import math
+import csv
 import os 
-import cv2  
+import argparse
+import gc
+import tracemalloc
+import threading
+import collections
+import mmap
+import struct
+import numpy as np
 from abc import ABC, abstractmethod
+from history import HistoryStore, PersistenceWriter
+from dictionary import WordDictionary
+from analytics import Histogram, TypingAnalytics
+from simulation import (GameSimulation, PlayerStats, RandomStreams, EntityStore, EntityPool, DEFAULT_WORDS,
+                        make_dictionary, new_seed, SIM_STEP, KEY_BACKSPACE, KEY_ENTER, KEY_ESCAPE)
+from replay import Replay, ReplayRecorder, replay_path, prune_replays
 
 if getattr(sys, 'frozen', False):
     BASE_DIR = os.path.dirname(sys.executable)
 else:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-DIR_SOUND = os.path.join(BASE_DIR, "sound")
-DIR_BG = os.path.join(BASE_DIR, "background")
+DIR_CACHE = os.path.join(BASE_DIR, "cache")
+BUNDLE_PATH = os.path.join(BASE_DIR, "assets.pak")
+WORDS_PATH = os.path.join(BASE_DIR, "words.dict")
+DIR_REPLAYS = os.path.join(BASE_DIR, "replays")
+
+ASSET_FILES = ["sound/type.wav", "sound/explode.wav", "sound/error.wav", "sound/damage.wav",
+               "sound/levelup.wav", "sound/gameover.wav", "sound/bgm.mp3", "background/background.mp4"]
+
+# cv2 & bundle dimuat belakangan (lihat load_cv2 dan open_asset_bundle)
+cv2 = None
+ASSETS = None
 
 # Nilai awal
 WIDTH, HEIGHT = 900, 700
 FPS = 60 
 
+# Logika game jalan di tick tetap (SIM_HZ), terlepas dari FPS render
+MAX_SIM_STEPS = 5
+
 C_BG = (5, 5, 15)           
 C_GRID = (20, 40, 60)       
 C_TEXT_MAIN = (240, 240, 255)
@@ -29,8 +58,106 @@ C_NEON_YELLOW = (255, 255, 0)
 C_ERROR = (255, 50, 50)
 C_GRAY = (100, 100, 100)
 
+class AssetBundle:
+    MAGIC = b"CTPK"
+    VERSION = 1
+    # magic, versi, panjang index JSON
+    HEADER = struct.Struct("<4sHI")
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.file = open(filepath, "rb")
+        magic, version, index_len = self.HEADER.unpack(self.file.read(self.HEADER.size))
+        if magic != self.MAGIC or version != self.VERSION:
+            self.file.close()
+            raise ValueError(f"not an asset bundle: {filepath}")
+        self.index = json.loads(self.file.read(index_len).decode("utf-8"))
+        self.data_start = self.HEADER.size + index_len
+        self.view = memoryview(mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def read(self, name):
+        offset, size, _ = self.index[name]
+        start = self.data_start + offset
+        return self.view[start:start + size]
+
+    def open(self, name):
+        return io.BytesIO(self.read(name))
+
+    def extract(self, name, dest_path):
+        # cv2 butuh path file asli; mtime dari index dipertahankan supaya cache frame tetap valid
+        offset, size, mtime_ns = self.index[name]
+        if os.path.exists(dest_path) and os.path.getsize(dest_path) == size and os.stat(dest_path).st_mtime_ns == mtime_ns:
+            return dest_path
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with open(dest_path + ".tmp", "wb") as f:
+            f.write(self.read(name))
+        os.replace(dest_path + ".tmp", dest_path)
+        os.utime(dest_path, ns=(mtime_ns, mtime_ns))
+        return dest_path
+
+def build_asset_bundle(out_path, names):
+    index = {}
+    blobs = []
+    offset = 0
+    for name in names:
+        path = os.path.join(BASE_DIR, *name.split("/"))
+        if not os.path.exists(path):
+            print(f"[WARNING] Asset not found, skipped: {path}")
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        index[name] = [offset, len(data), os.stat(path).st_mtime_ns]
+        blobs.append(data)
+        offset += len(data)
+
+    index_bytes = json.dumps(index).encode("utf-8")
+    with open(out_path + ".tmp", "wb") as f:
+        f.write(AssetBundle.HEADER.pack(AssetBundle.MAGIC, AssetBundle.VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for data in blobs:
+            f.write(data)
+    os.replace(out_path + ".tmp", out_path)
+    print(f"[SYSTEM] Asset bundle built: {out_path} ({len(index)} files, {offset // 1024} KB)")
+
+def open_asset_bundle():
+    global ASSETS
+    if os.path.exists(BUNDLE_PATH):
+        try:
+            ASSETS = AssetBundle(BUNDLE_PATH)
+            print(f"[SYSTEM] Asset bundle loaded: {BUNDLE_PATH}")
+        except Exception as e:
+            print(f"[ERROR] Failed to open asset bundle: {e}")
+    return ASSETS
+
+def asset_path(name):
+    # Path file di disk; kalau ada bundle, file diambil dari bundle
+    if ASSETS and name in ASSETS:
+        try:
+            return ASSETS.extract(name, os.path.join(DIR_CACHE, *name.split("/")))
+        except Exception as e:
+            print(f"[ERROR] Failed to extract {name}: {e}")
+    return os.path.join(BASE_DIR, *name.split("/"))
+
+def load_cv2():
+    # OpenCV berat di-import; cukup dimuat kalau video memang harus di-decode
+    global cv2
+    if cv2 is None:
+        import cv2 as cv2_module
+        cv2 = cv2_module
+    return cv2
+
 class VideoBackground:
-    def __init__(self, filepath, width, height):
+    CACHE_MAGIC = b"CTVC"
+    CACHE_VERSION = 1
+    # magic, versi, lebar, tinggi, jumlah frame, fps, mtime video (ns), alpha gelap
+    CACHE_HEADER = struct.Struct("<4sHHHIdqB")
+    CACHE_HEADER_SIZE = 64
+    MAX_CACHE_BYTES = 2 * 1024 ** 3
+
+    def __init__(self, filepath, width, height, threaded=True, buffer_size=8, dark_alpha=100, use_cache=True):
         self.filepath = filepath
         self.width = width
         self.height = height
@@ -39,34 +166,281 @@ class VideoBackground:
         self.success = False
         
         self.scale_buffer = 50 
-
-        if os.path.exists(filepath):
+        self.frame_size = (width + self.scale_buffer, height + self.scale_buffer)
+        self.frame_bytes = self.frame_size[0] * self.frame_size[1] * 3
+        self.fps = FPS
+
+        # Gelapnya dark_overlay di run() langsung dipanggang ke frame video
+        self.dark_alpha = dark_alpha
+        self.dim_factor = 1.0 - dark_alpha / 255.0
+
+        # Mode threaded: decode jalan di worker thread, main loop cuma ambil frame siap pakai
+        self.threaded = threaded
+        self.frames = collections.deque()
+        self.buffer_size = buffer_size
+        self.frame_lock = threading.Condition()
+        self.stop_event = threading.Event()
+        self.worker = None
+        self.play_start = None
+        self.frames_shown = 0
+
+        # Cache frame mentah di disk, sekali per resolusi
+        self.use_cache = use_cache
+        self.cache_path = os.path.join(DIR_CACHE, f"background_{self.frame_size[0]}x{self.frame_size[1]}.frames")
+        self.cache_file = None
+        self.cache_view = None
+        self.cache_frames = 0
+        self.cache_writer = None
+        self.cache_written = 0
+        self.cache_ready = False
+        self.source_mtime = 0
+
+        if filepath and os.path.exists(filepath):
+            self.source_mtime = os.stat(filepath).st_mtime_ns
+            if self.use_cache and self._open_cache():
+                self.success = True
+                print(f"[SYSTEM] Video cache loaded: {self.cache_path}")
+                return
             try:
+                load_cv2()
                 self.cap = cv2.VideoCapture(filepath)
+                native_fps = self.cap.get(cv2.CAP_PROP_FPS)
+                if native_fps and native_fps > 0:
+                    self.fps = native_fps
                 self.success = True
                 print(f"[SYSTEM] Video loaded: {filepath}")
             except Exception as e:
                 print(f"[ERROR] Failed to load video: {e}")
-        else:
+        elif filepath:
             print(f"[WARNING] Video file not found: {filepath}")
 
-    def update(self):
+        if self.success and self.use_cache:
+            self._begin_cache()
+
+        if self.success and self.threaded:
+            self.worker = threading.Thread(target=self._decode_loop, name="VideoDecoder", daemon=True)
+            self.worker.start()
+
+    def is_dimmed(self):
+        return self.surface is not None
+
+    @property
+    def mode(self):
+        # "cache" = putar dari mmap, "decode" = decode live (mungkin sambil menulis cache), "off" = tanpa video
         if not self.success:
-            return
+            return "off"
+        return "cache" if self.cache_view is not None else "decode"
+
+    def wait_for_cache(self, timeout=300.0):
+        # Untuk benchmark & cek alokasi: frame decoder dibuang tanpa menunggu jadwal video supaya cache
+        # selesai secepatnya, lalu pindah ke mmap. False kalau video tetap harus di-decode live.
+        deadline = time.perf_counter() + timeout
+        while (self.cache_writer is not None and not self.cache_ready and self.worker is not None
+               and self.worker.is_alive() and time.perf_counter() < deadline):
+            with self.frame_lock:
+                self.frames.clear()
+                self.frame_lock.notify_all()
+            time.sleep(0.005)
+        if not self.cache_ready and self.cache_writer is None and self.worker is not None:
+            # _finish_cache bisa masih berjalan di antara menutup writer dan menandai cache_ready
+            self.worker.join(timeout=1.0)
+        if self.cache_ready:
+            self._switch_to_cache()
+        return self.cache_view is not None
+
+    def _open_cache(self):
+        if not os.path.exists(self.cache_path):
+            return False
+        try:
+            f = open(self.cache_path, "rb")
+            header = f.read(self.CACHE_HEADER.size)
+            magic, version, w, h, count, fps, mtime, dark = self.CACHE_HEADER.unpack(header)
+            expected_size = self.CACHE_HEADER_SIZE + count * self.frame_bytes
+            valid = (magic == self.CACHE_MAGIC and version == self.CACHE_VERSION
+                     and (w, h) == self.frame_size and mtime == self.source_mtime
+                     and dark == self.dark_alpha and count > 0
+                     and os.fstat(f.fileno()).st_size == expected_size)
+            if not valid:
+                f.close()
+                print("[SYSTEM] Video cache is stale, rebuilding")
+                os.remove(self.cache_path)
+                return False
+            self.cache_file = f
+            self.cache_view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            self.cache_frames = count
+            self.fps = fps
+            return True
+        except Exception as e:
+            print(f"[ERROR] Failed to open video cache: {e}")
+            return False
 
+    def _begin_cache(self):
+        try:
+            frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            if frame_count * self.frame_bytes > self.MAX_CACHE_BYTES:
+                print("[WARNING] Video too long to cache, decoding live")
+                return
+            os.makedirs(DIR_CACHE, exist_ok=True)
+            self.cache_writer = open(self.cache_path + ".tmp", "wb")
+            self.cache_writer.write(bytes(self.CACHE_HEADER_SIZE))
+            self.cache_written = 0
+        except Exception as e:
+            print(f"[ERROR] Failed to start video cache: {e}")
+            self.cache_writer = None
+
+    def _write_cache_frame(self, data):
+        try:
+            self.cache_writer.write(data)
+            self.cache_written += 1
+        except Exception as e:
+            print(f"[ERROR] Failed to write video cache: {e}")
+            self._abort_cache()
+
+    def _finish_cache(self):
+        try:
+            header = self.CACHE_HEADER.pack(self.CACHE_MAGIC, self.CACHE_VERSION, self.frame_size[0], self.frame_size[1],
+                                            self.cache_written, self.fps, self.source_mtime, self.dark_alpha)
+            self.cache_writer.seek(0)
+            self.cache_writer.write(header)
+            self.cache_writer.close()
+            self.cache_writer = None
+            os.replace(self.cache_path + ".tmp", self.cache_path)
+            self.cache_ready = True
+            print(f"[SYSTEM] Video cache built: {self.cache_written} frames")
+        except Exception as e:
+            print(f"[ERROR] Failed to finish video cache: {e}")
+            self._abort_cache()
+
+    def _abort_cache(self):
+        try:
+            self.cache_writer.close()
+            os.remove(self.cache_path + ".tmp")
+        except Exception:
+            pass
+        self.cache_writer = None
+
+    def _read_frame(self):
         ret, frame = self.cap.read()
 
         if not ret:
+            if self.cache_writer:
+                if self.cache_written > 0:
+                    self._finish_cache()
+                    return None
+                self._abort_cache()
             self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
             ret, frame = self.cap.read()
         
         if ret:
-            new_w = self.width + self.scale_buffer
-            new_h = self.height + self.scale_buffer
-            frame = cv2.resize(frame, (new_w, new_h))
-            
+            frame = cv2.resize(frame, self.frame_size)
             frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            self.surface = pygame.image.frombuffer(frame.tobytes(), (new_w, new_h), "RGB")
+            frame = cv2.convertScaleAbs(frame, alpha=self.dim_factor)
+            # Buffer array langsung (contiguous uint8), tanpa salinan tobytes() per frame
+            data = frame.data
+            if self.cache_writer:
+                self._write_cache_frame(data)
+            return data
+        return None
+
+    def _decode_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                data = self._read_frame()
+            except Exception as e:
+                print(f"[ERROR] Video decode failed: {e}")
+                data = None
+            if data is None:
+                break
+            with self.frame_lock:
+                while len(self.frames) >= self.buffer_size and not self.stop_event.is_set():
+                    self.frame_lock.wait()
+                self.frames.append(data)
+
+    def _switch_to_cache(self):
+        # Cache selesai dibangun: hentikan decoder, lanjut putar dari mmap tanpa lompat frame
+        self.stop_event.set()
+        with self.frame_lock:
+            self.frame_lock.notify_all()
+        if self.worker:
+            self.worker.join(timeout=1.0)
+            self.worker = None
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+        self.frames.clear()
+        self.cache_ready = False
+        if not self._open_cache():
+            self.success = False
+
+    def _cache_frame_index(self):
+        now = time.perf_counter()
+        if self.play_start is None:
+            self.play_start = now - self.frames_shown / self.fps
+        return int((now - self.play_start) * self.fps) % self.cache_frames
+
+    def _next_buffered_frame(self):
+        now = time.perf_counter()
+        if self.play_start is None:
+            self.play_start = now
+        due = int((now - self.play_start) * self.fps)
+
+        data = None
+        with self.frame_lock:
+            # Kejar jadwal video asli; kalau decoder ketinggalan, jangan burst, geser jadwalnya
+            while self.frames_shown <= due and self.frames:
+                data = self.frames.popleft()
+                self.frames_shown += 1
+            if data is not None:
+                self.frame_lock.notify()
+        if self.frames_shown <= due - self.buffer_size:
+            self.play_start = now - self.frames_shown / self.fps
+        return data
+
+    def update(self):
+        if self.cache_ready:
+            self._switch_to_cache()
+
+        if not self.success:
+            return
+
+        if self.cache_view is not None:
+            start = self.CACHE_HEADER_SIZE + self._cache_frame_index() * self.frame_bytes
+            self.surface = pygame.image.frombuffer(self.cache_view[start:start + self.frame_bytes], self.frame_size, "RGB")
+            return
+
+        if self.threaded:
+            data = self._next_buffered_frame()
+        else:
+            data = self._read_frame()
+        
+        if data is not None:
+            self.surface = pygame.image.frombuffer(data, self.frame_size, "RGB")
+
+    def close(self):
+        self.stop_event.set()
+        with self.frame_lock:
+            self.frame_lock.notify_all()
+        if self.worker:
+            self.worker.join(timeout=1.0)
+            self.worker = None
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+        if self.cache_writer:
+            self._abort_cache()
+        self.surface = None
+        if self.cache_view is not None:
+            cache_map = self.cache_view.obj
+            try:
+                self.cache_view.release()
+                cache_map.close()
+            except BufferError:
+                pass
+            self.cache_view = None
+        if self.cache_file:
+            self.cache_file.close()
+            self.cache_file = None
+        self.success = False
 
     def draw(self, screen, offset=(0,0)):
         if self.surface:
@@ -77,49 +451,249 @@ class VideoBackground:
         else:
             screen.fill(C_BG)
 
+class FontRegistry:
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+class TextCache:
+    def __init__(self, fonts, max_entries=512):
+        self.fonts = fonts
+        self.max_entries = max_entries
+        self.surfaces = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, antialias=True):
+        key = (text, size, color, antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = self.fonts.get(size).render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+
+# Atlas cuma berisi huruf ASCII (a-z, A-Z), yaitu huruf yang boleh ada di kata kamus.
+# Kata dengan huruf lain (mis. daftar kata bawaan yang diubah) tidak punya layout dan dirender utuh lewat TEXT_CACHE.
+GLYPH_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+class GlyphAtlas:
+    # Satu sheet per (ukuran, warna) berisi semua huruf; kata dirakit dari potongan sheet dengan satu blits()
+    def __init__(self, fonts, chars=GLYPH_CHARS):
+        self.fonts = fonts
+        self.chars = chars
+        self.sheets = {}
+        self.metrics = {}
+
+    def glyphs(self, size):
+        # huruf -> (area di sheet, advance); sama untuk semua warna
+        glyphs = self.metrics.get(size)
+        if glyphs is None:
+            font = self.fonts.get(size)
+            glyphs = {}
+            x = 0
+            for ch, metric in zip(self.chars, font.metrics(self.chars)):
+                w, h = font.size(ch)
+                glyphs[ch] = (pygame.Rect(x, 0, w, h), metric[4])
+                x += w + 1
+            self.metrics[size] = glyphs
+        return glyphs
+
+    def sheet(self, size, color):
+        key = (size, color)
+        sheet = self.sheets.get(key)
+        if sheet is None:
+            font = self.fonts.get(size)
+            glyphs = self.glyphs(size)
+            width = max(rect.right for rect, _ in glyphs.values())
+            sheet = pygame.Surface((width, font.get_height()), pygame.SRCALPHA)
+            for ch, (rect, _) in glyphs.items():
+                # MAX ke sheet kosong = salin apa adanya, tanpa tepi gelap dari alpha blending
+                sheet.blit(font.render(ch, True, color), rect, special_flags=pygame.BLEND_RGBA_MAX)
+            self.sheets[key] = sheet
+        return sheet
+
+    def layout(self, text, size):
+        # [(area, offset x)] per huruf, None kalau ada huruf di luar atlas
+        glyphs = self.glyphs(size)
+        layout = []
+        x = 0
+        for ch in text:
+            glyph = glyphs.get(ch)
+            if glyph is None:
+                return None
+            layout.append((glyph[0], x))
+            x += glyph[1]
+        return layout
+
+# Dipakai bareng oleh semua entity & UI, surface hasil render jangan diubah permanen
+FONTS = FontRegistry()
+TEXT_CACHE = TextCache(FONTS)
+GLYPHS = GlyphAtlas(FONTS)
+
+# Kategori -> jumlah channel yang dicadangkan khusus untuk kategori itu
+CHANNEL_POOLS = {"alert": 4, "impact": 4, "ui": 4}
+
+# priority tinggi boleh mencuri channel dari priority yang lebih rendah
+SOUND_CONFIG = {
+    "type":     {"category": "ui",     "priority": 1, "max_voices": 3, "cooldown": 0.03},
+    "explode":  {"category": "impact", "priority": 2, "max_voices": 3, "cooldown": 0.04},
+    "error":    {"category": "alert",  "priority": 3, "max_voices": 1, "cooldown": 0.10},
+    "levelup":  {"category": "alert",  "priority": 4, "max_voices": 1, "cooldown": 0.20},
+    "damage":   {"category": "alert",  "priority": 5, "max_voices": 2, "cooldown": 0.0},
+    "gameover": {"category": "alert",  "priority": 6, "max_voices": 1, "cooldown": 0.0},
+}
+
 class SoundManager:
     def __init__(self):
         self.sounds = {}
         self.music_playing = False
         self.sfx_volume = 0.3   
         self.music_volume = 0.2 
+        self.volume_dirty = False
+        self.music_volume_dirty = False
+        self.last_played = {}
+        self.pools = {}
+        self.voices = {}
+        self.dropped = 0
+        self.stolen = 0
+        
+        self.music_source = None
         
         try:
             pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
             print("[SYSTEM] Audio Mixer Initialized")
+            self.setup_channels()
         except pygame.error:
             print("[WARNING] No Audio Device Found")
 
-        self.load_sound("type", os.path.join(DIR_SOUND, "type.wav"))
-        self.load_sound("explode", os.path.join(DIR_SOUND, "explode.wav"))
-        self.load_sound("error", os.path.join(DIR_SOUND, "error.wav"))
-        self.load_sound("damage", os.path.join(DIR_SOUND, "damage.wav"))
-        self.load_sound("levelup", os.path.join(DIR_SOUND, "levelup.wav"))
-        self.load_sound("gameover", os.path.join(DIR_SOUND, "gameover.wav"))
+    def load_assets(self):
+        self.load_sound("type", "sound/type.wav")
+        self.load_sound("explode", "sound/explode.wav")
+        self.load_sound("error", "sound/error.wav")
+        self.load_sound("damage", "sound/damage.wav")
+        self.load_sound("levelup", "sound/levelup.wav")
+        self.load_sound("gameover", "sound/gameover.wav")
         
-        self.load_music(os.path.join(DIR_SOUND, "bgm.mp3"))
-
-    def load_sound(self, name, filepath):
-        if os.path.exists(filepath):
-            try:
-                self.sounds[name] = pygame.mixer.Sound(filepath)
-                self.sounds[name].set_volume(self.sfx_volume)
-            except: 
-                pass
+        self.load_music("sound/bgm.mp3")
+
+    def setup_channels(self):
+        reserved = sum(CHANNEL_POOLS.values())
+        pygame.mixer.set_num_channels(reserved + 4)
+        # Channel cadangan tidak dipakai Sound.play() otomatis, hanya lewat pool di bawah
+        pygame.mixer.set_reserved(reserved)
+        index = 0
+        for category, count in CHANNEL_POOLS.items():
+            self.pools[category] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+
+    def load_sound(self, name, asset):
+        filepath = os.path.join(BASE_DIR, *asset.split("/"))
+        try:
+            if ASSETS and asset in ASSETS:
+                sound = pygame.mixer.Sound(file=ASSETS.open(asset))
+            elif os.path.exists(filepath):
+                sound = pygame.mixer.Sound(filepath)
+            else:
+                return
+            sound.set_volume(self.sfx_volume)
+            self.sounds[name] = sound
+        except: 
+            pass
 
-    def load_music(self, filepath):
-        if os.path.exists(filepath):
-            try:
+    def load_music(self, asset):
+        filepath = os.path.join(BASE_DIR, *asset.split("/"))
+        try:
+            if ASSETS and asset in ASSETS:
+                # Objek file harus tetap hidup selama musik di-stream
+                self.music_source = ASSETS.open(asset)
+                pygame.mixer.music.load(self.music_source, asset.rsplit(".", 1)[-1])
+            elif os.path.exists(filepath):
                 pygame.mixer.music.load(filepath)
-                pygame.mixer.music.set_volume(self.music_volume)
-                self.music_playing = True
-            except: 
-                pass
+            else:
+                return
+            pygame.mixer.music.set_volume(self.music_volume)
+            self.music_playing = True
+        except: 
+            pass
 
     def play(self, name):
-        if name in self.sounds:
-            self.sounds[name].set_volume(self.sfx_volume) 
-            self.sounds[name].play()
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        config = SOUND_CONFIG.get(name)
+        pool = self.pools.get(config["category"]) if config else None
+        if not pool:
+            sound.play()
+            return
+
+        now = time.perf_counter()
+        if now - self.last_played.get(name, -1.0) < config["cooldown"]:
+            self.dropped += 1
+            return
+
+        channel = self._pick_channel(name, config, pool)
+        if channel is None:
+            self.dropped += 1
+            return
+        channel.play(sound)
+        self.voices[channel] = (name, config["priority"], now)
+        self.last_played[name] = now
+
+    def _pick_channel(self, name, config, pool):
+        free = None
+        same_name = []
+        victim = None
+        for channel in pool:
+            if not channel.get_busy():
+                if free is None:
+                    free = channel
+                continue
+            voice_name, priority, started = self.voices.get(channel, (None, 0, 0.0))
+            if voice_name == name:
+                same_name.append((started, channel))
+            if victim is None or (priority, started) < victim[0]:
+                victim = ((priority, started), channel)
+
+        # Batas voice per suara: suara yang sama yang paling lama diulang dari awal
+        if len(same_name) >= config["max_voices"]:
+            self.stolen += 1
+            return min(same_name, key=lambda v: v[0])[1]
+        if free is not None:
+            return free
+        if victim is not None and victim[0][0] <= config["priority"]:
+            self.stolen += 1
+            return victim[1]
+        return None
+
+    def update(self):
+        # Perubahan volume dari slider diterapkan sekali per frame
+        if self.volume_dirty:
+            self.volume_dirty = False
+            for sound in self.sounds.values():
+                sound.set_volume(self.sfx_volume)
+        if self.music_volume_dirty:
+            self.music_volume_dirty = False
+            if self.music_playing:
+                try: 
+                    pygame.mixer.music.set_volume(self.music_volume)
+                except: 
+                    pass
 
     def play_music(self):
         if self.music_playing:
@@ -136,17 +710,14 @@ class SoundManager:
             pass
 
     def set_sfx_volume(self, volume):
-        self.sfx_volume = volume
-        for sound in self.sounds.values():
-            sound.set_volume(volume)
+        if volume != self.sfx_volume:
+            self.sfx_volume = volume
+            self.volume_dirty = True
 
     def set_music_volume(self, volume):
-        self.music_volume = volume
-        if self.music_playing:
-            try: 
-                pygame.mixer.music.set_volume(volume)
-            except: 
-                pass
+        if volume != self.music_volume:
+            self.music_volume = volume
+            self.music_volume_dirty = True
 
 class Slider:
     def __init__(self, x, y, w, h, initial_val, label):
@@ -154,7 +725,7 @@ class Slider:
         self.val = initial_val 
         self.label = label
         self.dragging = False
-        self.font = pygame.font.Font(None, 36)
+        self.font_size = 36
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -172,7 +743,7 @@ class Slider:
         self.val = max(0.0, min(1.0, relative_x / self.rect.width))
 
     def draw(self, surface):
-        label_surf = self.font.render(f"{self.label}: {int(self.val * 100)}%", True, C_TEXT_MAIN)
+        label_surf = TEXT_CACHE.render(f"{self.label}: {int(self.val * 100)}%", self.font_size, C_TEXT_MAIN)
         surface.blit(label_surf, (self.rect.x, self.rect.y - 30))
         pygame.draw.rect(surface, C_GRID, self.rect, border_radius=5)
         fill_width = int(self.rect.width * self.val)
@@ -187,7 +758,7 @@ class Button:
         self.rect = pygame.Rect(0, 0, 200, 50)
         self.rect.center = (WIDTH // 2, y_pos)
         self.action = action 
-        self.font = pygame.font.Font(None, 50)
+        self.font_size = 50
         self.hovered = False
 
     def check_hover(self, mouse_pos):
@@ -199,42 +770,26 @@ class Button:
 
     def draw(self, surface):
         color = C_NEON_CYAN if self.hovered else (100, 100, 100)
-        text_surf = self.font.render(self.text, True, color)
+        text_surf = TEXT_CACHE.render(self.text, self.font_size, color)
         pygame.draw.rect(surface, color, self.rect, 2, border_radius=10)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
-class LevelManager:
-    def __init__(self):
-        self.level = 1
-        
-    def check_level_up(self, current_score):
-        calculated_level = 1 + (current_score // 100)
-        if calculated_level > self.level:
-            self.level = calculated_level
-            return True
-        return False
-
-    def get_spawn_delay(self):
-        return max(20, 90 - (self.level * 5))
-
-    def get_speed_multiplier(self):
-        return self.level * 0.3
-
 class ScreenShake:
     def __init__(self):
         self.intensity = 0
         self.decay = 0.9 
         self.offset_x = 0
         self.offset_y = 0
+        self.rng = random.Random()
 
     def trigger(self, amount):
         self.intensity = amount
 
     def update(self):
         if self.intensity > 0.5:
-            self.offset_x = random.uniform(-self.intensity, self.intensity)
-            self.offset_y = random.uniform(-self.intensity, self.intensity)
+            self.offset_x = self.rng.uniform(-self.intensity, self.intensity)
+            self.offset_y = self.rng.uniform(-self.intensity, self.intensity)
             self.intensity *= self.decay
         else:
             self.offset_x = 0
@@ -244,201 +799,895 @@ class ScreenShake:
     def get_offset(self):
         return (self.offset_x, self.offset_y)
 
-class DataManager:
+class DataManager(PlayerStats):
     def __init__(self):
+        super().__init__()
         self.filepath = os.path.join(BASE_DIR, "game_data.json")
-        self.__score = 0
+        self.writer = PersistenceWriter()
+        self.history = None
+        try:
+            self.history = HistoryStore(os.path.join(BASE_DIR, "game_data.db"))
+            self.history.migrate_legacy_json(self.filepath)
+        except Exception as e:
+            print(f"[ERROR] Failed to open session history: {e}")
         self.__highscore = self._load_data()
-        self.__health = 100
-        self.__max_health = 100
-        self.__streak = 0 
 
     def _load_data(self):
+        highscore = 0
         try:
             if os.path.exists(self.filepath):
                 with open(self.filepath, "r") as f:
                     data = json.load(f)
-                    return data.get("highscore", 0)
-            else: 
-                return 0
-        except: 
-            return 0
-
-    def save_data(self):
-        if self.__score > self.__highscore:
-            self.__highscore = self.__score
-        try:
-            with open(self.filepath, "w") as f:
-                json.dump({"highscore": self.__highscore}, f)
+                    highscore = data.get("highscore", 0)
         except Exception as e:
-            print(f"[ERROR] Failed to save data: {e}")
+            # Jangan diam-diam jadi 0: riwayat SQLite tetap jadi sumber highscore
+            print(f"[WARNING] {self.filepath} unreadable, using session history: {e}")
+        if self.history:
+            highscore = max(highscore, self.history.highscore())
+        return highscore
+
+    def save_data(self, session=None):
+        if self.score > self.__highscore:
+            self.__highscore = self.score
+        # Semua penulisan ke disk jalan di thread writer, main loop tidak pernah menunggu disk
+        if self.history and session:
+            self.writer.submit(self.history.record_session, self.score, session["level"], session["seconds"],
+                               session["accuracy"], self.max_streak, session["hits"], session["misses"],
+                               session["keystrokes"], time.time() - session["seconds"], session.get("analytics"))
+        # game_data.json tetap ditulis sebagai cermin highscore
+        self.writer.save_json(self.filepath, {"highscore": self.__highscore})
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        if self.history:
+            self.history.close()
+            self.history = None
 
     @property
-    def score(self): 
-        return self.__score
-    @property
     def highscore(self): 
         return self.__highscore
-    @property
-    def health(self): 
-        return self.__health
-    @property
-    def streak(self): 
-        return self.__streak 
-
-    def reset_stats(self):
-        self.__score = 0
-        self.__health = self.__max_health
-        self.__streak = 0
-
-    def add_score(self, amount):
-        self.__score += amount
-
-    def take_damage(self, amount):
-        self.__health -= amount
-        self.reset_streak() 
-
-    def heal(self, amount):
-        self.__health += amount
-        if self.__health > self.__max_health:
-            self.__health = self.__max_health
-
-    def is_alive(self):
-        return self.__health > 0
-
-    def increment_streak(self):
-        self.__streak += 1
-        if self.__streak > 0 and self.__streak % 5 == 0:
-            return True 
-        return False
-
-    def reset_streak(self):
-        self.__streak = 0
 
 class Entity(ABC, pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
+
+    def save_prev(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def lerp_pos(self, alpha):
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
     @abstractmethod
     def update(self): 
         pass
     @abstractmethod
-    def draw(self, surface, offset): 
+    def draw(self, surface, offset, alpha=1.0): 
         pass
 
-class Particle(Entity):
-    def __init__(self, x, y, color):
-        super().__init__(x, y)
-        angle = random.uniform(0, 6.28)
-        speed = random.uniform(2, 5)
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        self.life = 255
-        self.color = color
-        self.size = random.randint(2, 4)
+class ParticleSystem:
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.limit = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.prev_pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int16)
+        self.size = np.zeros(capacity, dtype=np.int16)
+        self.color = np.zeros(capacity, dtype=np.int16)
+        self.palette = []
+        self.sprites = {}
+        self.rng = np.random.default_rng()
+
+    def __len__(self):
+        return self.count
+
+    def seed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    def clear(self):
+        self.count = 0
+
+    def _color_index(self, color):
+        if color not in self.palette:
+            self.palette.append(color)
+        return self.palette.index(color)
+
+    def set_limit(self, limit):
+        self.limit = min(limit, self.capacity)
+        self.count = min(self.count, self.limit)
+
+    def spawn(self, x, y, color, amount=12):
+        amount = min(amount, self.limit - self.count)
+        if amount <= 0:
+            return
+        start, end = self.count, self.count + amount
+
+        angle = self.rng.uniform(0, 6.28, amount)
+        speed = self.rng.uniform(2, 5, amount)
+        self.pos[start:end] = (x, y)
+        self.prev_pos[start:end] = (x, y)
+        self.vel[start:end, 0] = np.cos(angle) * speed
+        self.vel[start:end, 1] = np.sin(angle) * speed
+        self.life[start:end] = 255
+        self.size[start:end] = self.rng.integers(2, 5, amount)
+        self.color[start:end] = self._color_index(color)
+        self.count = end
 
     def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 8 
-
-    def draw(self, surface, offset):
-        if self.life > 0:
-            tx = self.x + offset[0]
-            ty = self.y + offset[1]
-            s = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-            s.fill((*self.color, self.life))
-            surface.blit(s, (tx, ty))
+        n = self.count
+        if n == 0:
+            return
+        self.prev_pos[:n] = self.pos[:n]
+        self.pos[:n] += self.vel[:n]
+        self.life[:n] -= 8
+
+        # Partikel mati dibuang sekaligus, sisanya dipadatkan ke depan array
+        alive = self.life[:n] > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count < n:
+            for arr in (self.pos, self.prev_pos, self.vel, self.life, self.size, self.color):
+                arr[:alive_count] = arr[:n][alive]
+            self.count = alive_count
+
+    def _sprite(self, size, color_idx, alpha):
+        key = (size, color_idx, alpha)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            sprite.fill((*self.palette[color_idx], alpha))
+            self.sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface, offset, alpha=1.0):
+        n = self.count
+        if n == 0:
+            return
+        pos = self.prev_pos[:n] + (self.pos[:n] - self.prev_pos[:n]) * alpha
+        xs = (pos[:, 0] + offset[0]).astype(np.int32).tolist()
+        ys = (pos[:, 1] + offset[1]).astype(np.int32).tolist()
+        sprite = self._sprite
+        batch = [(sprite(size, color_idx, alpha), (x, y))
+                 for size, color_idx, alpha, x, y in zip(self.size[:n].tolist(), self.color[:n].tolist(),
+                                                        self.life[:n].tolist(), xs, ys)]
+        surface.blits(batch, doreturn=False)
 
 class FloatingText(Entity):
     def __init__(self, x, y, text, color):
         super().__init__(x, y)
+        self.reset(x, y, text, color)
+
+    def reset(self, x, y, text, color):
+        self.slot = -1
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
         self.text = text
         self.color = color
-        self.font = pygame.font.Font(None, 30)
+        self.font_size = 30
         self.life = 255
         self.vy = -2 
 
     def update(self):
+        self.save_prev()
         self.y += self.vy
         self.life -= 5 
 
-    def draw(self, surface, offset):
+    def draw(self, surface, offset, alpha=1.0):
         if self.life > 0:
-            tx = self.x + offset[0]
-            ty = self.y + offset[1]
-            txt_surf = self.font.render(self.text, True, self.color)
+            x, y = self.lerp_pos(alpha)
+            tx = x + offset[0]
+            ty = y + offset[1]
+            txt_surf = TEXT_CACHE.render(self.text, self.font_size, self.color)
             txt_surf.set_alpha(self.life)
             surface.blit(txt_surf, (tx, ty))
+            txt_surf.set_alpha(255)
 
 class Meteor(Entity):
-    def __init__(self, text, level_speed_bonus):
-        x = random.randint(50, WIDTH - 150)
+    # Dimatikan QualityGovernor di tingkat kualitas rendah
+    glow = True
+
+    def __init__(self, text, x, base_speed):
         super().__init__(x, -60)
+        self.word_surf = None
+        self.reset(text, x, base_speed)
+
+    def reset(self, text, x, base_speed):
+        self.slot = -1
+        self.x = self.prev_x = x
+        self.y = self.prev_y = -60
         self.text = text
-        self.base_speed = random.uniform(1.0, 2.0) + level_speed_bonus
-        self.font = pygame.font.Font(None, 40)
+        self.base_speed = base_speed
+        self.font_size = 40
         self.color = C_TEXT_MAIN
         self.active_glow = False
+        self.layout = None
+        self.word_state = None
 
     def update(self):
+        self.save_prev()
         self.y += self.base_speed
 
-    def check_match(self, input_text):
-        if self.text.startswith(input_text) and len(input_text) > 0:
+    def set_highlight(self, active):
+        if active:
             self.color = C_NEON_CYAN
             self.active_glow = True
         else:
             self.color = C_TEXT_MAIN
             self.active_glow = False
 
-    def draw(self, surface, offset):
-        tx = self.x + offset[0]
-        ty = self.y + offset[1]
-        if self.active_glow:
-            glow_surf = self.font.render(self.text, True, C_NEON_CYAN)
-            surface.blit(glow_surf, (tx - 1, ty))
-            surface.blit(glow_surf, (tx + 1, ty))
-        main_surf = self.font.render(self.text, True, self.color)
-        surface.blit(main_surf, (tx, ty))
+    def draw(self, surface, offset, alpha=1.0, typed=0):
+        x, y = self.lerp_pos(alpha)
+        tx = x + offset[0]
+        ty = y + offset[1]
+        if self.layout is None:
+            self.layout = GLYPHS.layout(self.text, self.font_size) or ()
+        if not self.layout:
+            # Huruf di luar atlas: render kata utuh seperti biasa
+            if self.active_glow and Meteor.glow:
+                glow_surf = TEXT_CACHE.render(self.text, self.font_size, C_NEON_CYAN)
+                surface.blit(glow_surf, (tx - 1, ty))
+                surface.blit(glow_surf, (tx + 1, ty))
+            surface.blit(TEXT_CACHE.render(self.text, self.font_size, self.color), (tx, ty))
+            return
+
+        state = (typed if self.active_glow else 0, self.active_glow and Meteor.glow)
+        if state != self.word_state:
+            self.word_state = state
+            self.compose_word(*state)
+        surface.blit(self.word_surf, (tx - 1, ty))
+
+    def compose_word(self, typed, glow):
+        # Dirakit ulang dari atlas cuma saat jumlah huruf terketik berubah, bukan tiap frame
+        size = self.font_size
+        layout = self.layout
+        last_rect, last_x = layout[-1]
+        width = last_x + last_rect.width + 2
+        height = FONTS.get(size).get_height()
+        if self.word_surf is None or self.word_surf.get_size() != (width, height):
+            self.word_surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        else:
+            self.word_surf.fill((0, 0, 0, 0))
+
+        # BLEND_RGBA_MAX ke surface transparan: piksel glyph tersalin utuh tanpa tepi gelap
+        flags = pygame.BLEND_RGBA_MAX
+        batch = []
+        if typed:
+            # Sudah diketik: cyan + glow, huruf berikutnya: kuning, sisanya: warna biasa
+            done = GLYPHS.sheet(size, C_NEON_CYAN)
+            if glow:
+                for rect, ox in layout[:typed]:
+                    batch.append((done, (ox, 0), rect, flags))
+                    batch.append((done, (ox + 2, 0), rect, flags))
+            for rect, ox in layout[:typed]:
+                batch.append((done, (ox + 1, 0), rect, flags))
+            if typed < len(layout):
+                rect, ox = layout[typed]
+                batch.append((GLYPHS.sheet(size, C_NEON_YELLOW), (ox + 1, 0), rect, flags))
+                typed += 1
+        if typed < len(layout):
+            rest = GLYPHS.sheet(size, C_TEXT_MAIN)
+            for rect, ox in layout[typed:]:
+                batch.append((rest, (ox + 1, 0), rect, flags))
+        self.word_surf.blits(batch, False)
+
+
+class CachedLayer:
+    def __init__(self, size, compose, area=None):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.compose = compose
+        self.area = pygame.Rect(area) if area else self.surface.get_rect()
+        self.blit_rect = self.area
+        self.baked = None
+        self.key = None
+        self.redraws = 0
+
+    def draw(self, screen, key):
+        # Rasterisasi ulang cuma kalau nilai yang ditampilkan berubah
+        if key != self.key or self.redraws == 0:
+            self.key = key
+            self.surface.fill((0, 0, 0, 0))
+            self.compose(self.surface, key)
+            self.blit_rect = self.surface.get_bounding_rect().clip(self.area)
+            self.baked = None
+            if self.blit_rect.width and self.blit_rect.height:
+                # RLE: piksel transparan dilewati saat blit, jauh lebih murah untuk layer UI yang jarang
+                self.baked = self.surface.subsurface(self.blit_rect).copy()
+                self.baked.set_alpha(255, pygame.RLEACCEL)
+            self.redraws += 1
+        if self.baked:
+            screen.blit(self.baked, self.blit_rect.topleft)
+
+# Tingkat kualitas dari tertinggi ke terendah, dipilih otomatis oleh QualityGovernor
+QUALITY_LEVELS = [
+    {"name": "high",    "video_every": 1, "particle_cap": 4096, "glow": True,  "overlays": True},
+    {"name": "medium",  "video_every": 2, "particle_cap": 1024, "glow": True,  "overlays": True},
+    {"name": "low",     "video_every": 3, "particle_cap": 384,  "glow": False, "overlays": False},
+    {"name": "minimal", "video_every": 6, "particle_cap": 128,  "glow": False, "overlays": False},
+]
+
+class QualityGovernor:
+    WINDOW = 60
+    # Turun kalau p90 waktu kerja frame > 95% budget dua jendela berturut-turut,
+    # naik lagi kalau < 60% budget lima jendela berturut-turut (hysteresis)
+    DOWNGRADE_RATIO = 0.95
+    UPGRADE_RATIO = 0.6
+    DOWNGRADE_WINDOWS = 2
+    UPGRADE_WINDOWS = 5
+    COOLDOWN = 2.0
+
+    def __init__(self, target_fps=FPS, level=0, enabled=True, on_change=None):
+        self.target_fps = target_fps
+        self.enabled = enabled
+        self.on_change = on_change
+        self.samples = collections.deque(maxlen=self.WINDOW)
+        self.frames = 0
+        self.slow_windows = 0
+        self.fast_windows = 0
+        self.last_change = 0.0
+        self.level = level
+        self.settings = QUALITY_LEVELS[level]
+
+    @property
+    def budget(self):
+        return 1.0 / self.target_fps
+
+    def set_target(self, fps):
+        self.target_fps = fps
+        self.samples.clear()
+        self.slow_windows = self.fast_windows = 0
+
+    def set_level(self, level, reason=""):
+        level = max(0, min(len(QUALITY_LEVELS) - 1, level))
+        if level == self.level:
+            return False
+        old = self.settings["name"]
+        self.level = level
+        self.settings = QUALITY_LEVELS[level]
+        self.last_change = time.perf_counter()
+        self.slow_windows = self.fast_windows = 0
+        s = self.settings
+        print(f"[QUALITY] {old} -> {s['name']}{reason}: video every {s['video_every']} frame(s), "
+              f"particles <= {s['particle_cap']}, glow {'on' if s['glow'] else 'off'}, overlays {'full' if s['overlays'] else 'simple'}")
+        if self.on_change:
+            self.on_change(s)
+        return True
+
+    def record(self, frame_seconds):
+        # frame_seconds = waktu kerja frame (tanpa sleep clock.tick)
+        if not self.enabled:
+            return False
+        self.samples.append(frame_seconds)
+        self.frames += 1
+        if self.frames % (self.WINDOW // 2) or len(self.samples) < self.WINDOW:
+            return False
+
+        ordered = sorted(self.samples)
+        p90 = ordered[int(len(ordered) * 0.9)]
+        budget = self.budget
+        if p90 > budget * self.DOWNGRADE_RATIO:
+            self.slow_windows += 1
+            self.fast_windows = 0
+        elif p90 < budget * self.UPGRADE_RATIO:
+            self.fast_windows += 1
+            self.slow_windows = 0
+        else:
+            self.slow_windows = self.fast_windows = 0
+
+        if time.perf_counter() - self.last_change < self.COOLDOWN:
+            return False
+        reason = f" (p90 {p90 * 1000:.1f} ms, budget {budget * 1000:.1f} ms)"
+        if self.slow_windows >= self.DOWNGRADE_WINDOWS:
+            return self.set_level(self.level + 1, reason)
+        if self.fast_windows >= self.UPGRADE_WINDOWS:
+            return self.set_level(self.level - 1, reason)
+        return False
+
+class GCGuard:
+    # Selama PLAY objek lama dibekukan (gc.freeze) dan ambang gen0 dinaikkan:
+    # collector jarang jalan, dan kalau jalan cuma memindai objek yang baru dibuat
+    PLAY_THRESHOLD = (20000, 50, 1000)
+
+    def __init__(self):
+        self.active = False
+        self.saved_threshold = gc.get_threshold()
+        self.collections = [0, 0, 0]
+        self.max_pause = 0.0
+        self.started = None
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        if not self.active:
+            return
+        if phase == "start":
+            self.started = time.perf_counter()
+        elif self.started is not None:
+            self.max_pause = max(self.max_pause, time.perf_counter() - self.started)
+            self.collections[info["generation"]] += 1
+            self.started = None
+
+    def enter_play(self):
+        if self.active:
+            return
+        gc.collect()
+        gc.freeze()
+        self.saved_threshold = gc.get_threshold()
+        gc.set_threshold(*self.PLAY_THRESHOLD)
+        self.active = True
+
+    def exit_play(self):
+        if not self.active:
+            return
+        self.active = False
+        gc.set_threshold(*self.saved_threshold)
+        gc.unfreeze()
+
+class LatencyHistogram(Histogram):
+    # Bin 1 ms sampai max_ms, sisanya masuk bin overflow: memori tetap berapapun lamanya sesi
+    def __init__(self, bin_ms=1.0, max_ms=100):
+        super().__init__(bin_ms, max_ms)
+        self.bin_ms = bin_ms
+
+    def summary(self):
+        return (f"n={self.total} p50 {self.percentile(50):.0f} ms  p95 {self.percentile(95):.0f} ms  "
+                f"p99 {self.percentile(99):.0f} ms  max {self.max:.1f} ms")
+
+    def bars(self, width=40, bucket=2):
+        # Histogram teks dengan bucket `bucket` ms, sampai p99
+        top = int(self.percentile(99) / self.bin_ms) + 1
+        step = max(1, int(bucket / self.bin_ms))
+        rows = []
+        for start in range(0, min(top, len(self.counts)), step):
+            count = sum(self.counts[start:start + step])
+            peak = max(1, max(self.counts))
+            rows.append(f"{start * self.bin_ms:>5.0f}-{(start + step) * self.bin_ms:<4.0f}ms {'#' * int(count / (peak * step) * width):<{width}} {count}")
+        return rows
+
+class LatencyTracker:
+    # Waktu dari tombol diterima sampai display.flip() yang menampilkan hasilnya.
+    # pygame tidak memberi timestamp SDL per event, jadi "diterima" = saat event diambil dari antrian;
+    # "window" = dari poll sebelumnya sampai flip, batas atas kalau tombol sudah masuk antrian sejak saat itu.
+    def __init__(self):
+        self.echo = LatencyHistogram()
+        self.hit = LatencyHistogram()
+        self.window = LatencyHistogram()
+        self.prev_poll = None
+        self.last_poll = None
+        self.pending = []
+        self.pending_hits = []
+        self.last_key = None
+
+    def poll(self):
+        self.prev_poll = self.last_poll
+        self.last_poll = time.perf_counter()
+
+    def key(self):
+        now = time.perf_counter()
+        self.pending.append((now, self.prev_poll if self.prev_poll is not None else now))
+        self.last_key = now
+
+    def mark_hit(self):
+        # Ledakan tampil di flip setelah tick yang memproses ketikan terakhir
+        if self.last_key is not None:
+            self.pending_hits.append(self.last_key)
+            self.last_key = None
+
+    def flip(self):
+        if not self.pending and not self.pending_hits:
+            return
+        now = time.perf_counter()
+        for pressed, window_start in self.pending:
+            self.echo.add((now - pressed) * 1000.0)
+            self.window.add((now - window_start) * 1000.0)
+        for pressed in self.pending_hits:
+            self.hit.add((now - pressed) * 1000.0)
+        self.pending.clear()
+        self.pending_hits.clear()
+
+    def overlay_lines(self):
+        return [f"key->flip p50 {self.echo.percentile(50):.0f} p95 {self.echo.percentile(95):.0f} ms",
+                f"hit->flip p50 {self.hit.percentile(50):.0f} p95 {self.hit.percentile(95):.0f} ms"]
+
+    def report(self):
+        if self.echo.total == 0:
+            return
+        print(f"[LATENCY] key -> flip     {self.echo.summary()}")
+        print(f"[LATENCY] poll window     {self.window.summary()}")
+        if self.hit.total:
+            print(f"[LATENCY] hit -> flip     {self.hit.summary()}")
+        for row in self.echo.bars():
+            print(f"[LATENCY] {row}")
+
+class FramePacer:
+    # Pengganti clock.tick untuk mode low-latency: tidur sampai sedikit sebelum deadline lalu spin,
+    # jadi tidak ada oversleep 1-2 ms dari SDL_Delay yang menunda poll input berikutnya
+    SPIN_MARGIN = 0.002
 
-class CyberTyperGame:
     def __init__(self):
+        self.deadline = None
+
+    def wait(self, fps):
+        now = time.perf_counter()
+        if not fps:
+            self.deadline = now
+            return
+        frame_time = 1.0 / fps
+        if self.deadline is None or now - self.deadline > frame_time:
+            self.deadline = now
+        self.deadline += frame_time
+        remaining = self.deadline - now - self.SPIN_MARGIN
+        if remaining > 0:
+            time.sleep(remaining)
+        while time.perf_counter() < self.deadline:
+            pass
+
+class FrameProfiler:
+    PHASES = ("video", "events", "update", "render", "flip")
+    COUNTERS = ("meteors", "particles", "floaters")
+
+    def __init__(self, enabled=False, history=120, max_trace=100000):
+        self.enabled = enabled
+        self.show_overlay = False
+        # Status enabled sebelum overlay dibuka (True kalau --profile), dipulihkan saat overlay ditutup
+        self.enabled_before_overlay = enabled
+        self.dump_path = None
+        self.samples = {name: collections.deque(maxlen=history) for name in self.PHASES + ("frame",)}
+        self.trace = collections.deque(maxlen=max_trace)
+        self.frame_no = 0
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.current = dict.fromkeys(self.PHASES, 0.0)
+        self.overlay_lines = []
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay:
+            self.enabled_before_overlay = self.enabled
+            self.enabled = True
+        else:
+            self.enabled = self.enabled_before_overlay
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        self.frame_start = now
+        self.last_mark = now
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.current[phase] = (now - self.last_mark) * 1000.0
+        self.last_mark = now
+
+    def end_frame(self, counts):
+        total = (time.perf_counter() - self.frame_start) * 1000.0
+        self.frame_no += 1
+        for phase in self.PHASES:
+            self.samples[phase].append(self.current[phase])
+        self.samples["frame"].append(total)
+        self.trace.append((self.frame_no, total, *(self.current[p] for p in self.PHASES), *counts))
+
+    def averages(self):
+        return {name: (sum(values) / len(values) if values else 0.0) for name, values in self.samples.items()}
+
+    def draw_overlay(self, surface, counts, extra=()):
+        # Teks overlay cuma dirender ulang tiap 15 frame biar overlay-nya sendiri murah
+        if self.frame_no % 15 == 0 or not self.overlay_lines:
+            font = FONTS.get(20)
+            avg = self.averages()
+            lines = [f"frame {avg['frame']:.2f} ms"]
+            lines += [f"{phase:<7}{avg[phase]:.2f} ms" for phase in self.PHASES]
+            lines += [f"{name}: {value}" for name, value in zip(self.COUNTERS, counts)]
+            lines.append(f"text cache {TEXT_CACHE.hits}/{TEXT_CACHE.misses}")
+            lines += extra
+            self.overlay_lines = [font.render(line, True, C_NEON_GREEN) for line in lines]
+
+        panel_h = 18 * len(self.overlay_lines) + 10
+        pygame.draw.rect(surface, (0, 0, 0), (10, 130, 240 if extra else 190, panel_h))
+        for i, line in enumerate(self.overlay_lines):
+            surface.blit(line, (16, 135 + i * 18))
+
+    def dump(self, path=None):
+        path = path or self.dump_path or os.path.join(BASE_DIR, f"profile_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+        header = ("frame", "total_ms") + tuple(f"{p}_ms" for p in self.PHASES) + self.COUNTERS
+        try:
+            with open(path, "w", newline="") as f:
+                if path.endswith(".json"):
+                    json.dump([dict(zip(header, row)) for row in self.trace], f)
+                else:
+                    writer = csv.writer(f)
+                    writer.writerow(header)
+                    writer.writerows(self.trace)
+            print(f"[SYSTEM] Profile trace saved: {path}")
+        except Exception as e:
+            print(f"[ERROR] Failed to save profile trace: {e}")
+
+class AllocProfiler:
+    # tracemalloc per frame: blok yang dialokasikan selama frame dan masih hidup di akhir frame, dikelompokkan
+    # per baris kode. Alokasi sementara yang sudah dibebaskan sebelum frame selesai cuma terlihat di peak_bytes.
+    FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+               tracemalloc.Filter(False, "<unknown>"))
+
+    def __init__(self, top=15, max_trace=100000):
+        self.enabled = False
+        self.dump_path = None
+        self.top = top
+        self.owns_tracing = False
+        self.own_file = None
+        self.own_lines = range(0)
+        self.previous = None
+        self.base = 0
+        self.frame_no = 0
+        # (file, baris) -> [byte, blok, frame yang mengalokasikan]
+        self.lines = {}
+        self.trace = collections.deque(maxlen=max_trace)
+        self.overlay = []
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.owns_tracing = True
+        # Baris milik profiler ini sendiri (baris trace, teks overlay) tidak ikut dihitung
+        import inspect
+        source, first = inspect.getsourcelines(AllocProfiler)
+        self.own_file = os.path.abspath(__file__)
+        self.own_lines = range(first, first + len(source))
+        self.enabled = True
+        self.previous = tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+
+    def stop(self):
+        self.enabled = False
+        self.previous = None
+        if self.owns_tracing:
+            tracemalloc.stop()
+            self.owns_tracing = False
+
+    def reset(self):
+        self.lines.clear()
+        self.trace.clear()
+        self.frame_no = 0
+
+    def begin_frame(self):
+        tracemalloc.reset_peak()
+        self.base = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self, tag=""):
+        peak = tracemalloc.get_traced_memory()[1] - self.base
+        snapshot = tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+        new_bytes = new_blocks = 0
+        lines = self.lines
+        for diff in snapshot.compare_to(self.previous, "lineno"):
+            if diff.size_diff <= 0 and diff.count_diff <= 0:
+                continue
+            where = diff.traceback[0]
+            if where.lineno in self.own_lines and where.filename == self.own_file:
+                continue
+            size = max(0, diff.size_diff)
+            count = max(0, diff.count_diff)
+            new_bytes += size
+            new_blocks += count
+            entry = lines.get((where.filename, where.lineno))
+            if entry is None:
+                lines[(where.filename, where.lineno)] = [size, count, 1]
+            else:
+                entry[0] += size
+                entry[1] += count
+                entry[2] += 1
+        self.previous = snapshot
+        self.frame_no += 1
+        self.trace.append((self.frame_no, tag, new_bytes, new_blocks, peak))
+        if self.frame_no % 15 == 0 or not self.overlay:
+            self.overlay = [f"alloc {new_bytes} B / {new_blocks} blk", f"alloc peak {peak} B"]
+        return new_bytes, new_blocks, peak
+
+    def top_lines(self, n=None):
+        ranked = sorted(self.lines.items(), key=lambda kv: kv[1][0], reverse=True)
+        return ranked[:n or self.top]
+
+    def report(self, n=None):
+        if not self.trace:
+            return
+        frames = len(self.trace)
+        total_bytes = sum(row[2] for row in self.trace)
+        total_blocks = sum(row[3] for row in self.trace)
+        peak = max(row[4] for row in self.trace)
+        print(f"[ALLOC] {frames} frames: {total_bytes / frames:.0f} B and {total_blocks / frames:.1f} blocks "
+              f"still alive per frame, max in-frame peak {peak} B")
+        for (filename, lineno), (size, count, hits) in self.top_lines(n):
+            print(f"[ALLOC]   {size / frames:>9.0f} B/frame {count / frames:>7.2f} blk/frame  "
+                  f"({hits} frames)  {os.path.basename(filename)}:{lineno}")
+
+    def dump(self, path=None):
+        path = path or self.dump_path or os.path.join(BASE_DIR, f"alloc_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+        header = ("frame", "state", "new_bytes", "new_blocks", "peak_bytes")
+        try:
+            with open(path, "w", newline="") as f:
+                if path.endswith(".json"):
+                    lines = [{"file": fn, "line": ln, "bytes": s, "blocks": c, "frames": h}
+                             for (fn, ln), (s, c, h) in self.top_lines(len(self.lines))]
+                    json.dump({"frames": [dict(zip(header, row)) for row in self.trace], "lines": lines}, f)
+                else:
+                    writer = csv.writer(f)
+                    writer.writerow(header)
+                    writer.writerows(self.trace)
+            print(f"[SYSTEM] Allocation trace saved: {path}")
+        except Exception as e:
+            print(f"[ERROR] Failed to save allocation trace: {e}")
+
+class Display:
+    # Game selalu digambar di kanvas ukuran logis (WIDTH x HEIGHT); jendela boleh ukuran berapa saja.
+    # Video + overlay layar penuh digambar di backdrop beresolusi render_scale, lalu diperbesar sekali ke kanvas.
+    def __init__(self, window_size=(WIDTH, HEIGHT), render_scale=1.0):
+        self.size = (WIDTH, HEIGHT)
+        self.render_scale = max(0.25, min(1.0, render_scale))
+        self.window = None
+        self.canvas = None
+        self.view = None
+        self.view_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        self.backdrop_size = (round(WIDTH * self.render_scale), round(HEIGHT * self.render_scale))
+        self.backdrop = pygame.Surface(self.backdrop_size) if self.render_scale < 1.0 else None
+        self.set_window(window_size)
+
+    def set_window(self, size):
+        self.window = pygame.display.set_mode(size, pygame.RESIZABLE)
+        w, h = self.window.get_size()
+        if (w, h) == self.size:
+            # Ukuran pas: gambar langsung ke layar, tanpa kanvas & tanpa scale
+            self.canvas = self.window
+            self.view = None
+            self.view_rect = self.window.get_rect()
+            return
+        # Letterbox: rasio aspek dijaga, sisa jendela jadi bar hitam
+        scale = min(w / self.size[0], h / self.size[1])
+        self.view_rect = pygame.Rect(0, 0, round(self.size[0] * scale), round(self.size[1] * scale))
+        self.view_rect.center = (w // 2, h // 2)
+        if self.canvas is None or self.canvas is self.window or self.canvas.get_size() != self.size:
+            self.canvas = pygame.Surface(self.size)
+        self.window.fill((0, 0, 0))
+        self.view = self.window.subsurface(self.view_rect)
+
+    def draw_target(self):
+        return self.backdrop if self.backdrop is not None else self.canvas
+
+    def video_size(self):
+        return self.backdrop_size
+
+    def scale_offset(self, offset):
+        if self.backdrop is None:
+            return offset
+        return (offset[0] * self.render_scale, offset[1] * self.render_scale)
+
+    def compose_backdrop(self):
+        if self.backdrop is not None:
+            pygame.transform.scale(self.backdrop, self.size, self.canvas)
+
+    def present(self):
+        if self.view is not None:
+            pygame.transform.scale(self.canvas, self.view_rect.size, self.view)
+        pygame.display.flip()
+
+    def to_logical(self, pos):
+        rect = self.view_rect
+        x = (pos[0] - rect.x) * self.size[0] / rect.width
+        y = (pos[1] - rect.y) * self.size[1] / rect.height
+        return (int(x), int(y))
+
+    def map_event(self, event):
+        # Posisi mouse di event diubah ke koordinat kanvas supaya Button & Slider tidak perlu tahu soal scaling
+        if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION) and self.view is not None:
+            event.pos = self.to_logical(event.pos)
+
+    def mouse_pos(self):
+        return self.to_logical(pygame.mouse.get_pos())
+
+class CyberTyperGame:
+    def __init__(self, window_size=(WIDTH, HEIGHT), render_scale=1.0):
         pygame.mixer.pre_init(44100, -16, 2, 2048)
         pygame.init()
         
-        global WIDTH, HEIGHT
-        WIDTH, HEIGHT = 900, 700
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))  # WINDOW NORMAL
-        print(f"[SYSTEM] Screen set to windowed: {WIDTH}x{HEIGHT}")
+        self.display = Display(window_size, render_scale)
+        self.screen = self.display.canvas
+        print(f"[SYSTEM] Screen set to windowed: {self.display.window.get_width()}x{self.display.window.get_height()}")
+        if self.display.backdrop is not None:
+            print(f"[SYSTEM] Background rendered at {self.display.render_scale:.2f}x "
+                  f"({self.display.backdrop_size[0]}x{self.display.backdrop_size[1]})")
         
         pygame.display.set_caption("CYBER TYPER: NEON PROTOCOL")
         self.clock = pygame.time.Clock()
+        self.target_fps = FPS
+        self.running = False
+        self.last_frame_time = None
+        self.sim_accumulator = 0.0
+        self.profiler = FrameProfiler()
+        self.alloc_profiler = AllocProfiler()
+        self.governor = QualityGovernor(self.target_fps, on_change=self.apply_quality)
+        self.latency = LatencyTracker()
+        self.analytics = TypingAnalytics()
+        self.session_summary = None
+        # Naik tiap sesi baru; kunci cache layer Game Over (id() dict ringkasan bisa dipakai ulang setelah GC)
+        self.session_no = 0
+        self.low_latency = False
+        self.pacer = FramePacer()
+        self.video_frame = 0
+        self.first_frame_reported = False
         
         self.sound = SoundManager()
-        self.sound.play_music() 
 
-        video_path = os.path.join(DIR_BG, "background.mp4")
-        self.video_bg = VideoBackground(video_path, WIDTH, HEIGHT)
+        # Menu sudah bisa dipakai sementara suara & video dimuat di background
+        self.video_bg = VideoBackground(None, *self.display.video_size())
+        self.assets_ready = threading.Event()
+        # Dipegang saat video_bg diganti loader atau ditutup saat keluar
+        self.asset_lock = threading.Lock()
+        self.closing = False
+        self.asset_loader = threading.Thread(target=self.load_assets, name="AssetLoader", daemon=True)
+        self.asset_loader.start()
 
         self.data = DataManager()
         self.shake = ScreenShake()
-        self.level_manager = LevelManager()
         
         self.state = "MENU" 
-        self.words = ["system", "hacker", "protocol", "circuit", "binary", 
-                      "cyber", "neon", "matrix", "linux", "python", "script",
-                      "server", "proxy", "firewall", "encryption", "node", "data",
-                      "java", "object", "class", "void", "public", "static",
-                      "terminal", "root", "sudo", "apt", "kernel", "bios"]
+        self.words = self.load_words()
+        self.sim = GameSimulation(words=self.words, stats=self.data, meteor_factory=Meteor, width=WIDTH, height=HEIGHT)
         
+        self.floaters = EntityStore()
+        self.floater_pool = EntityPool(FloatingText, 64)
+        self.particles = ParticleSystem()
+        self.gc_guard = GCGuard()
+        self.recorder = None
+        self.record_replays = True
+        self.replay = None
+        self.replay_fast = False
         self.levelup_popup_timer = 0
+        self.damage_flash_timer = 0
         self.setup_menu()
         
         self.slider_bgm = Slider(WIDTH//2 - 150, 250, 300, 20, self.sound.music_volume, "BGM Volume")
         self.slider_sfx = Slider(WIDTH//2 - 150, 350, 300, 20, self.sound.sfx_volume, "SFX Volume")
         self.btn_back = Button("BACK", 500, self.back_to_menu)
+        self.setup_layers()
+
+    @property
+    def input_buffer(self):
+        return self.sim.input_buffer
+
+    def apply_quality(self, settings):
+        self.particles.set_limit(settings["particle_cap"])
+        Meteor.glow = settings["glow"]
+
+    def set_target_fps(self, fps):
+        self.target_fps = fps
+        self.governor.set_target(fps)
+
+    def load_words(self):
+        if os.path.exists(WORDS_PATH):
+            try:
+                words = WordDictionary.load(WORDS_PATH)
+                print(f"[SYSTEM] Word dictionary loaded: {len(words)} words")
+                return words
+            except Exception as e:
+                print(f"[ERROR] Failed to load word dictionary: {e}")
+        return make_dictionary(DEFAULT_WORDS)
+
+    def load_assets(self):
+        open_asset_bundle()
+        self.sound.load_assets()
+        if self.state != "PLAY":
+            self.sound.play_music()
+        video_bg = VideoBackground(asset_path("background/background.mp4"), *self.display.video_size())
+        with self.asset_lock:
+            if self.closing:
+                # Game sudah keluar duluan: tidak ada yang akan menutup background ini selain loader sendiri
+                video_bg.close()
+                return
+            self.video_bg = video_bg
+        self.assets_ready.set()
+        print(f"[SYSTEM] Assets ready after {(time.perf_counter() - BOOT_START) * 1000:.0f} ms")
 
     def setup_menu(self):
         self.buttons = [
@@ -447,15 +1696,31 @@ class CyberTyperGame:
             Button("QUIT", 460, self.quit_game)
         ]
 
-    def start_game(self):
-        self.data.reset_stats()
-        self.level_manager = LevelManager()
-        self.meteors = []
-        self.particles = []
-        self.floaters = [] 
-        self.input_buffer = ""
-        self.spawn_timer = 0
+    def start_game(self, seed=None):
+        if seed is None:
+            seed = self.replay.seed if self.replay else new_seed()
+        streams = RandomStreams(seed)
+        self.sim.reset(seed)
+        self.shake.rng = streams.stream("shake")
+        self.particles.seed(streams.int_seed("particles"))
+
+        self.finish_recording()
+        if self.replay:
+            self.replay.rewind()
+        elif self.record_replays:
+            try:
+                self.recorder = ReplayRecorder(replay_path(DIR_REPLAYS), seed, self.sim.dictionary.checksum())
+            except OSError as e:
+                print(f"[WARNING] Session will not be recorded: {e}")
+            prune_replays(DIR_REPLAYS)
+
+        self.particles.clear()
+        self.clear_floaters()
+        self.analytics.reset()
+        self.session_summary = None
+        self.session_no += 1
         self.state = "PLAY"
+        self.gc_guard.enter_play()
         self.sound.play("levelup") 
 
     def open_options(self):
@@ -464,238 +1729,470 @@ class CyberTyperGame:
     def back_to_menu(self):
         self.state = "MENU"
 
+    def finish_recording(self, result=None):
+        if self.recorder:
+            self.recorder.finish(result)
+            self.recorder = None
+
+    def press(self, key):
+        if self.replay:
+            # Saat replay keyboard diabaikan, kecuali ESC untuk berhenti
+            if key == KEY_ESCAPE:
+                self.sim.press(key)
+            return
+        if self.recorder:
+            self.recorder.press(self.sim.tick, key)
+        self.latency.key()
+        correct_before = self.sim.correct_keystrokes
+        self.sim.press(key)
+        self.track_key(key, self.sim.correct_keystrokes > correct_before)
+
+    def track_key(self, key, correct):
+        now = time.perf_counter()
+        if key == KEY_BACKSPACE:
+            self.analytics.backspace(now)
+        elif key == KEY_ENTER:
+            self.analytics.abandon_word()
+        elif key != KEY_ESCAPE:
+            self.analytics.key(now, key.lower(), correct)
+
+    def close_video(self):
+        with self.asset_lock:
+            self.closing = True
+            self.video_bg.close()
+
     def quit_game(self):
+        self.finish_recording()
+        self.close_video()
+        self.data.close()
         pygame.quit()
         sys.exit()
 
+    def spawn_floater(self, x, y, text, color):
+        self.floaters.add(self.floater_pool.acquire(x, y, text, color))
+
+    def clear_floaters(self):
+        for f in self.floaters:
+            self.floater_pool.release(f)
+        self.floaters.clear()
+
     def spawn_particles(self, x, y, color):
-        for _ in range(12):
-            self.particles.append(Particle(x, y, color))
+        self.particles.spawn(x, y, color, 12)
 
-    def run(self):
-        running = True
-        while running:
-            self.shake.update()
-            offset = self.shake.get_offset()
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
 
-            self.video_bg.update()
-            self.video_bg.draw(self.screen, offset)
-            
-            dark_overlay = pygame.Surface((WIDTH, HEIGHT))
-            dark_overlay.fill((0, 0, 0))
-            dark_overlay.set_alpha(100) 
-            self.screen.blit(dark_overlay, (0,0))
+        if event.type == pygame.VIDEORESIZE:
+            self.display.set_window(event.size)
+            self.screen = self.display.canvas
+            return
+        self.display.map_event(event)
+
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F3:
+                self.profiler.toggle_overlay()
+                return
+            if event.key == pygame.K_F4:
+                self.profiler.dump()
+                return
+        
+        if self.state == "MENU":
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                for btn in self.buttons:
+                    btn.handle_click()
 
-            mouse_pos = pygame.mouse.get_pos()
+        elif self.state == "OPTIONS":
+            self.slider_bgm.handle_event(event)
+            self.slider_sfx.handle_event(event)
             
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                
-                if self.state == "MENU":
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        for btn in self.buttons:
-                            btn.handle_click()
-
-                elif self.state == "OPTIONS":
-                    self.slider_bgm.handle_event(event)
-                    self.slider_sfx.handle_event(event)
-                    
-                    self.sound.set_music_volume(self.slider_bgm.val)
-                    self.sound.set_sfx_volume(self.slider_sfx.val)
-                    
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.btn_back.handle_click()
-                        if self.slider_sfx.rect.collidepoint(event.pos):
-                            self.sound.play("type")
-
-                elif self.state == "PLAY":
-                    if event.type == pygame.KEYDOWN:
-                        
-                        if event.key == pygame.K_RETURN:
-                            if len(self.input_buffer) > 0: 
-                                self.input_buffer = "" 
-                                self.data.add_score(-5) 
-                                self.data.reset_streak() 
-                                self.shake.trigger(3) 
-                                self.floaters.append(FloatingText(WIDTH//2, HEIGHT-60, "-5 (Panic)", C_ERROR))
-                                self.sound.play("error") 
-
-                        elif event.key == pygame.K_BACKSPACE:
-                            self.input_buffer = self.input_buffer[:-1]
-                            self.sound.play("type") 
-                        
-                        elif event.key == pygame.K_ESCAPE:
-                            self.state = "GAMEOVER"
-                            self.data.save_data()
-                            self.sound.stop_music()
-                            self.sound.play("gameover")
-                        else:
-                            if event.unicode.isalpha():
-                                self.input_buffer += event.unicode
-                                self.sound.play("type") 
-
-                elif self.state == "GAMEOVER":
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_RETURN:
-                            self.state = "MENU"
-                            self.sound.play_music() 
-
-            if self.state == "MENU":
-                title_font = pygame.font.Font(None, 80)
-                title = title_font.render("CYBER TYPER", True, C_NEON_MAGENTA)
-                title_shadow = title_font.render("CYBER TYPER", True, (0,0,0))
-                self.screen.blit(title_shadow, (WIDTH//2 - title.get_width()//2 + 3, 103))
-                self.screen.blit(title, (WIDTH//2 - title.get_width()//2, 100))
-                
-                score_font = pygame.font.Font(None, 40)
-                hs_text = score_font.render(f"High Score: {self.data.highscore}", True, C_NEON_CYAN)
-                self.screen.blit(hs_text, (WIDTH//2 - hs_text.get_width()//2, 180))
+            self.sound.set_music_volume(self.slider_bgm.val)
+            self.sound.set_sfx_volume(self.slider_sfx.val)
+            
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                self.btn_back.handle_click()
+                if self.slider_sfx.rect.collidepoint(event.pos):
+                    self.sound.play("type")
 
-                for btn in self.buttons:
-                    btn.check_hover(mouse_pos)
-                    btn.draw(self.screen)
-
-            elif self.state == "OPTIONS":
-                opt_title = pygame.font.Font(None, 60).render("AUDIO SETTINGS", True, C_NEON_MAGENTA)
-                self.screen.blit(opt_title, (WIDTH//2 - opt_title.get_width()//2, 100))
-
-                self.slider_bgm.draw(self.screen)
-                self.slider_sfx.draw(self.screen)
-
-                self.btn_back.check_hover(mouse_pos)
-                self.btn_back.draw(self.screen)
-
-            elif self.state == "PLAY":
-                if self.level_manager.check_level_up(self.data.score):
-                    self.levelup_popup_timer = 60
-                    self.shake.trigger(10)
-                    self.sound.play("levelup") 
-
-                self.spawn_timer += 1
-                if self.spawn_timer > self.level_manager.get_spawn_delay():
-                    self.meteors.append(Meteor(random.choice(self.words), self.level_manager.get_speed_multiplier()))
-                    self.spawn_timer = 0
-
-                meteors_to_remove = []
-                hit_found = False 
-
-                for meteor in self.meteors:
-                    meteor.check_match(self.input_buffer)
-                    meteor.update()
-                    
-                    if self.input_buffer == meteor.text and not hit_found:
-                        hit_found = True
-                        meteors_to_remove.append(meteor) 
-                        
-                        self.data.add_score(10)
-                        is_bonus = self.data.increment_streak()
-                        if is_bonus:
-                            self.data.heal(10) 
-                            self.floaters.append(FloatingText(WIDTH//2, HEIGHT//2, "STREAK 5X! +10 HP", C_NEON_GREEN))
-                            self.shake.trigger(8)
-                            self.sound.play("levelup")
-
-                        self.spawn_particles(meteor.x, meteor.y, C_NEON_CYAN)
-                        self.floaters.append(FloatingText(meteor.x, meteor.y, "+10", C_NEON_CYAN)) 
-                        self.shake.trigger(5)
-                        self.sound.play("explode")
-                    
-                    elif meteor.y > HEIGHT:
-                        if meteor not in meteors_to_remove: 
-                            meteors_to_remove.append(meteor) 
-                        
-                        self.data.take_damage(20) 
-                        self.floaters.append(FloatingText(meteor.x, HEIGHT-50, "-20 HP", C_ERROR)) 
-                        self.floaters.append(FloatingText(meteor.x, HEIGHT-80, "Streak Lost!", C_ERROR))
-                        self.shake.trigger(20)
-                        
-                        flash_s = pygame.Surface((WIDTH, HEIGHT))
-                        flash_s.fill(C_ERROR)
-                        flash_s.set_alpha(50)
-                        self.screen.blit(flash_s, (0,0))
-                        self.sound.play("damage")
+        elif self.state == "PLAY":
+            if event.type == pygame.KEYDOWN:
                 
-                if hit_found:
-                    self.input_buffer = ""
-                
-                for m in meteors_to_remove:
-                    if m in self.meteors:
-                        self.meteors.remove(m)
-                
-                for p in self.particles[:]:
-                    p.update()
-                    if p.life <= 0: 
-                        self.particles.remove(p)
-                
-                for f in self.floaters[:]:
-                    f.update()
-                    if f.life <= 0: 
-                        self.floaters.remove(f)
-
-                for m in self.meteors: 
-                    m.draw(self.screen, offset)
-                for p in self.particles: 
-                    p.draw(self.screen, offset)
-                for f in self.floaters: 
-                    f.draw(self.screen, offset) 
-
-                pygame.draw.rect(self.screen, C_GRID, (0, HEIGHT-60, WIDTH, 60))
-                
-                inp_surf = pygame.font.Font(None, 50).render(self.input_buffer, True, C_NEON_MAGENTA)
-                self.screen.blit(inp_surf, (WIDTH//2 - inp_surf.get_width()//2 + offset[0], HEIGHT-45 + offset[1]))
-                
-                tip_font = pygame.font.Font(None, 20)
-                tip_surf = tip_font.render("PRESS ENTER TO CLEAR TYPO (-5 PTS)", True, (100, 100, 100))
-                self.screen.blit(tip_surf, (WIDTH//2 - tip_surf.get_width()//2, HEIGHT-15))
+                if event.key == pygame.K_RETURN:
+                    self.press(KEY_ENTER)
+                elif event.key == pygame.K_BACKSPACE:
+                    self.press(KEY_BACKSPACE)
+                elif event.key == pygame.K_ESCAPE:
+                    self.press(KEY_ESCAPE)
+                else:
+                    if event.unicode.isalpha():
+                        self.press(event.unicode)
+                self.apply_sim_events()
+
+        elif self.state == "GAMEOVER":
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN:
+                    self.state = "MENU"
+                    self.replay = None
+                    self.replay_fast = False
+                    self.sound.play_music() 
+
+    def step(self):
+        # Satu tick simulasi = 1/SIM_HZ detik, semua angka per-tick di bawah dulunya per-frame
+        self.shake.update()
+
+        if self.state != "PLAY":
+            return
 
-                pygame.draw.rect(self.screen, (50,0,0), (20, 20, 200, 20))
-                pygame.draw.rect(self.screen, C_ERROR, (20, 20, 2 * self.data.health, 20))
-                pygame.draw.rect(self.screen, (200,200,200), (20, 20, 200, 20), 2)
-                
-                ui_font = pygame.font.Font(None, 36)
-                sc_surf = ui_font.render(f"SCORE: {self.data.score}", True, C_TEXT_MAIN)
-                lvl_surf = ui_font.render(f"LEVEL: {self.level_manager.level}", True, C_NEON_GREEN)
-                
-                streak_color = C_NEON_YELLOW if self.data.streak > 0 else (100, 100, 100)
-                streak_surf = ui_font.render(f"STREAK: {self.data.streak}", True, streak_color)
-
-                self.screen.blit(sc_surf, (WIDTH - 180, 20))
-                self.screen.blit(lvl_surf, (WIDTH - 180, 50))
-                self.screen.blit(streak_surf, (WIDTH - 180, 80))
-
-                if self.levelup_popup_timer > 0:
-                    self.levelup_popup_timer -= 1
-                    popup_font = pygame.font.Font(None, 100)
-                    popup_surf = popup_font.render("LEVEL UP!", True, C_NEON_GREEN)
-                    if self.levelup_popup_timer % 10 < 5: 
-                         self.screen.blit(popup_surf, (WIDTH//2 - popup_surf.get_width()//2, HEIGHT//2 - 100))
-
-                if not self.data.is_alive():
-                    self.data.save_data()
-                    self.state = "GAMEOVER"
-                    self.sound.stop_music()
-                    self.sound.play("gameover")
-
-            elif self.state == "GAMEOVER":
-                overlay = pygame.Surface((WIDTH, HEIGHT))
-                overlay.fill((0,0,0))
-                overlay.set_alpha(150)
-                self.screen.blit(overlay, (0,0))
-
-                go_font = pygame.font.Font(None, 100)
-                go_text = go_font.render("SYSTEM FAILURE", True, C_ERROR)
-                self.screen.blit(go_text, (WIDTH//2 - go_text.get_width()//2 + offset[0], 250 + offset[1]))
-                
-                info_font = pygame.font.Font(None, 40)
-                info = info_font.render(f"Final Score: {self.data.score}", True, C_TEXT_MAIN)
-                restart = info_font.render("Press ENTER to Main Menu", True, C_NEON_CYAN)
-                self.screen.blit(info, (WIDTH//2 - info.get_width()//2, 350))
-                self.screen.blit(restart, (WIDTH//2 - restart.get_width()//2, 450))
+        if self.replay:
+            self.replay.apply(self.sim)
+        self.sim.step()
+        self.apply_sim_events()
+
+        self.particles.update()
+        
+        # Mundur: swap-remove cuma memindahkan elemen yang sudah di-update
+        floaters = self.floaters.items
+        for i in range(len(floaters) - 1, -1, -1):
+            f = floaters[i]
+            f.update()
+            if f.life <= 0: 
+                self.floaters.remove(f)
+                self.floater_pool.release(f)
+
+        if self.levelup_popup_timer > 0:
+            self.levelup_popup_timer -= 1
+
+    def apply_sim_events(self):
+        for kind, meteor in self.sim.drain_events():
+            if kind == "type":
+                self.sound.play("type")
+
+            elif kind == "panic":
+                self.shake.trigger(3) 
+                self.spawn_floater(WIDTH//2, HEIGHT-60, f"-{self.sim.difficulty.panic_penalty} (Panic)", C_ERROR)
+                self.sound.play("error") 
+
+            elif kind == "levelup":
+                self.levelup_popup_timer = 60
+                self.shake.trigger(10)
+                self.sound.play("levelup") 
+
+            elif kind == "streak_bonus":
+                d = self.sim.difficulty
+                self.spawn_floater(WIDTH//2, HEIGHT//2, f"STREAK {d.streak_bonus_every}X! +{d.streak_heal} HP", C_NEON_GREEN)
+                self.shake.trigger(8)
+                self.sound.play("levelup")
+
+            elif kind == "hit":
+                self.latency.mark_hit()
+                self.analytics.word(time.perf_counter(), meteor.text)
+                self.spawn_particles(meteor.x, meteor.y, C_NEON_CYAN)
+                self.spawn_floater(meteor.x, meteor.y, f"+{self.sim.difficulty.hit_score}", C_NEON_CYAN)
+                self.shake.trigger(5)
+                self.sound.play("explode")
+
+            elif kind == "damage":
+                self.spawn_floater(meteor.x, HEIGHT-50, f"-{self.sim.difficulty.meteor_damage} HP", C_ERROR)
+                self.spawn_floater(meteor.x, HEIGHT-80, "Streak Lost!", C_ERROR)
+                self.shake.trigger(20)
+                self.damage_flash_timer = 1
+                self.sound.play("damage")
+
+            elif kind == "gameover":
+                result = self.sim.result()
+                if self.analytics.start is not None:
+                    self.session_summary = result["analytics"] = self.analytics.summary()
+                if self.replay:
+                    # Replay tidak masuk riwayat; cukup dicek hasilnya sama dengan rekaman
+                    verified = self.replay.verify(result)
+                    status = "not verified" if verified is None else ("matches recording" if verified else "MISMATCH")
+                    print(f"[REPLAY] Finished: score {result['score']}, level {result['level']} ({status})")
+                else:
+                    self.finish_recording(result)
+                    self.data.save_data(result)
+                self.gc_guard.exit_play()
+                self.state = "GAMEOVER"
+                self.sound.stop_music()
+                self.sound.play("gameover")
+
+    def setup_layers(self):
+        self.dark_overlay = pygame.Surface(self.display.backdrop_size)
+        self.dark_overlay.fill((0, 0, 0))
+        self.dark_overlay.set_alpha(100) 
+
+        self.flash_overlay = pygame.Surface(self.display.backdrop_size)
+        self.flash_overlay.fill(C_ERROR)
+        self.flash_overlay.set_alpha(50)
+
+        size = (WIDTH, HEIGHT)
+        self.menu_layer = CachedLayer(size, self.compose_menu, (0, 90, WIDTH, 400))
+        self.options_layer = CachedLayer(size, self.compose_options, (0, 90, WIDTH, 440))
+        self.hud_layer = CachedLayer(size, self.compose_hud, (0, 0, WIDTH, 115))
+        self.input_bar_layer = CachedLayer(size, self.compose_input_bar, (0, HEIGHT-60, WIDTH, 60))
+        self.gameover_layer = CachedLayer(size, self.compose_gameover)
+
+    def compose_menu(self, surface, key):
+        title = TEXT_CACHE.render("CYBER TYPER", 80, C_NEON_MAGENTA)
+        title_shadow = TEXT_CACHE.render("CYBER TYPER", 80, (0,0,0))
+        surface.blit(title_shadow, (WIDTH//2 - title.get_width()//2 + 3, 103))
+        surface.blit(title, (WIDTH//2 - title.get_width()//2, 100))
+        
+        hs_text = TEXT_CACHE.render(f"High Score: {self.data.highscore}", 40, C_NEON_CYAN)
+        surface.blit(hs_text, (WIDTH//2 - hs_text.get_width()//2, 180))
+
+        for btn in self.buttons:
+            btn.draw(surface)
+
+    def compose_options(self, surface, key):
+        opt_title = TEXT_CACHE.render("AUDIO SETTINGS", 60, C_NEON_MAGENTA)
+        surface.blit(opt_title, (WIDTH//2 - opt_title.get_width()//2, 100))
+
+        self.slider_bgm.draw(surface)
+        self.slider_sfx.draw(surface)
+        self.btn_back.draw(surface)
+
+    def compose_hud(self, surface, key):
+        pygame.draw.rect(surface, (50,0,0), (20, 20, 200, 20))
+        pygame.draw.rect(surface, C_ERROR, (20, 20, 2 * self.data.health, 20))
+        pygame.draw.rect(surface, (200,200,200), (20, 20, 200, 20), 2)
+        
+        sc_surf = TEXT_CACHE.render(f"SCORE: {self.data.score}", 36, C_TEXT_MAIN)
+        lvl_surf = TEXT_CACHE.render(f"LEVEL: {self.sim.level_manager.level}", 36, C_NEON_GREEN)
+        
+        streak_color = C_NEON_YELLOW if self.data.streak > 0 else (100, 100, 100)
+        streak_surf = TEXT_CACHE.render(f"STREAK: {self.data.streak}", 36, streak_color)
+
+        surface.blit(sc_surf, (WIDTH - 180, 20))
+        surface.blit(lvl_surf, (WIDTH - 180, 50))
+        surface.blit(streak_surf, (WIDTH - 180, 80))
+
+    def compose_input_bar(self, surface, key):
+        pygame.draw.rect(surface, C_GRID, (0, HEIGHT-60, WIDTH, 60))
+        tip_surf = TEXT_CACHE.render(f"PRESS ENTER TO CLEAR TYPO (-{self.sim.difficulty.panic_penalty} PTS)", 20, (100, 100, 100))
+        surface.blit(tip_surf, (WIDTH//2 - tip_surf.get_width()//2, HEIGHT-15))
+
+    def compose_gameover(self, surface, key):
+        surface.fill((0, 0, 0, 150))
+        info = TEXT_CACHE.render(f"Final Score: {self.data.score}", 40, C_TEXT_MAIN)
+        restart = TEXT_CACHE.render("Press ENTER to Main Menu", 40, C_NEON_CYAN)
+        surface.blit(info, (WIDTH//2 - info.get_width()//2, 350))
+        surface.blit(restart, (WIDTH//2 - restart.get_width()//2, 520))
+
+        s = self.session_summary
+        if s:
+            lines = [f"WPM {s['wpm']:.0f} (peak {s['peak_wpm']:.0f})   ACC {s['accuracy'] * 100:.0f}%   "
+                     f"WORD {s['word_time_avg']:.2f}s   KEY GAP {s['interkey_p50_ms']:.0f} ms"]
+            if s["weakest_keys"]:
+                lines.append("WEAKEST KEYS: " + "  ".join(f"{k.upper()} {acc * 100:.0f}%" for k, acc in s["weakest_keys"]))
+            if s["slowest_words"]:
+                lines.append("SLOWEST: " + "  ".join(f"{w} {t:.1f}s" for w, t in s["slowest_words"][:3]))
+            for i, line in enumerate(lines):
+                surf = TEXT_CACHE.render(line, 26, C_NEON_YELLOW if i == 0 else C_GRAY)
+                surface.blit(surf, (WIDTH//2 - surf.get_width()//2, 400 + i * 30))
+
+    def render(self, alpha):
+        offset = self.shake.get_offset()
+
+        backdrop = self.display.draw_target()
+        self.video_bg.draw(backdrop, self.display.scale_offset(offset))
+        
+        overlays = self.governor.settings["overlays"]
+        if overlays and not self.video_bg.is_dimmed():
+            backdrop.blit(self.dark_overlay, (0,0))
+        if self.state == "PLAY" and self.damage_flash_timer > 0 and overlays:
+            backdrop.blit(self.flash_overlay, (0,0))
+        self.display.compose_backdrop()
+
+        mouse_pos = self.display.mouse_pos()
+
+        if self.state == "MENU":
+            for btn in self.buttons:
+                btn.check_hover(mouse_pos)
+            key = (self.data.highscore, tuple(btn.hovered for btn in self.buttons))
+            self.menu_layer.draw(self.screen, key)
+
+        elif self.state == "OPTIONS":
+            self.btn_back.check_hover(mouse_pos)
+            key = (self.slider_bgm.val, self.slider_sfx.val, self.btn_back.hovered)
+            self.options_layer.draw(self.screen, key)
+
+        elif self.state == "PLAY":
+            if self.damage_flash_timer > 0:
+                if not overlays:
+                    pygame.draw.rect(self.screen, C_ERROR, (0, 0, WIDTH, HEIGHT), 12)
+                # Dihitung per frame yang digambar, bukan per tick: di bawah 60 FPS flash tetap sempat tampil
+                self.damage_flash_timer -= 1
+
+            typed = len(self.sim.targets.buffer)
+            for m in self.sim.meteors: 
+                m.draw(self.screen, offset, alpha, typed)
+            self.particles.draw(self.screen, offset, alpha)
+            for f in self.floaters: 
+                f.draw(self.screen, offset, alpha) 
+
+            self.input_bar_layer.draw(self.screen, None)
             
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            inp_surf = TEXT_CACHE.render(self.input_buffer, 50, C_NEON_MAGENTA)
+            self.screen.blit(inp_surf, (WIDTH//2 - inp_surf.get_width()//2 + offset[0], HEIGHT-45 + offset[1]))
+
+            key = (self.data.score, self.data.health, self.data.streak, self.sim.level_manager.level)
+            self.hud_layer.draw(self.screen, key)
+
+            if self.levelup_popup_timer > 0:
+                popup_surf = TEXT_CACHE.render("LEVEL UP!", 100, C_NEON_GREEN)
+                if self.levelup_popup_timer % 10 < 5: 
+                     self.screen.blit(popup_surf, (WIDTH//2 - popup_surf.get_width()//2, HEIGHT//2 - 100))
+
+        elif self.state == "GAMEOVER":
+            self.gameover_layer.draw(self.screen, (self.data.score, self.session_no))
+
+            go_text = TEXT_CACHE.render("SYSTEM FAILURE", 100, C_ERROR)
+            self.screen.blit(go_text, (WIDTH//2 - go_text.get_width()//2 + offset[0], 250 + offset[1]))
+
+        if not self.assets_ready.is_set():
+            loading = TEXT_CACHE.render("LOADING ASSETS...", 20, C_GRAY)
+            self.screen.blit(loading, (WIDTH - loading.get_width() - 10, HEIGHT - 25))
+
+    def run_frame(self, dt=None):
+        now = time.perf_counter()
+        if dt is None:
+            dt = now - self.last_frame_time if self.last_frame_time is not None else SIM_STEP
+        self.last_frame_time = now
+
+        # Profiler mati = cuma satu cek None per fase
+        prof = self.profiler if self.profiler.enabled else None
+        if prof:
+            prof.begin_frame()
+        alloc = self.alloc_profiler if self.alloc_profiler.enabled else None
+        if alloc:
+            alloc.begin_frame()
+
+        self.video_frame += 1
+        if self.video_frame >= self.governor.settings["video_every"]:
+            self.video_frame = 0
+            self.video_bg.update()
+        if prof:
+            prof.mark("video")
+
+        self.poll_events()
+        if prof:
+            prof.mark("events")
+
+        # Fixed timestep: logika jalan di SIM_HZ berapapun FPS render-nya
+        self.sim_accumulator += dt
+        steps = 0
+        while self.sim_accumulator >= SIM_STEP:
+            self.step()
+            self.sim_accumulator -= SIM_STEP
+            steps += 1
+            if steps >= MAX_SIM_STEPS:
+                self.sim_accumulator = 0.0
+                break
+        self.sound.update()
+        if self.low_latency:
+            # Tombol yang masuk selama video/update langsung ikut frame ini, bukan frame berikutnya
+            self.poll_events()
+        if prof:
+            prof.mark("update")
+
+        self.render(self.sim_accumulator / SIM_STEP)
+        if prof:
+            counts = (len(self.sim.meteors), len(self.particles), len(self.floaters))
+            if prof.show_overlay:
+                extra = self.latency.overlay_lines() + (self.alloc_profiler.overlay if alloc else [])
+                prof.draw_overlay(self.screen, counts, extra)
+            prof.mark("render")
+
+        self.display.present()
+        self.latency.flip()
+        if prof:
+            prof.mark("flip")
+            prof.end_frame(counts)
+
+        self.governor.record(time.perf_counter() - now)
+        if alloc:
+            alloc.end_frame(self.state)
+
+        if not self.first_frame_reported:
+            self.first_frame_reported = True
+            print(f"[SYSTEM] First interactive frame after {(time.perf_counter() - BOOT_START) * 1000:.0f} ms")
+
+    def poll_events(self):
+        self.latency.poll()
+        for event in pygame.event.get():
+            self.handle_event(event)
+
+    def run(self):
+        self.running = True
+        while self.running:
+            if self.replay_fast and self.state == "PLAY":
+                # Replay secepatnya: jatah tick maksimum per frame, tanpa batas FPS
+                self.run_frame(SIM_STEP * MAX_SIM_STEPS)
+                self.clock.tick()
+                continue
+            self.run_frame()
+            if self.low_latency:
+                self.pacer.wait(self.target_fps)
+            else:
+                self.clock.tick(self.target_fps)
+
+        self.latency.report()
+        print(f"[SYSTEM] Text cache: {TEXT_CACHE.hits} hits, {TEXT_CACHE.misses} misses")
+        self.gc_guard.exit_play()
+        gen0, gen1, gen2 = self.gc_guard.collections
+        print(f"[SYSTEM] GC during play: {gen0}/{gen1}/{gen2} collections (gen0/1/2), max pause {self.gc_guard.max_pause * 1000:.2f} ms")
+        if self.profiler.dump_path:
+            self.profiler.dump()
+        if self.alloc_profiler.enabled:
+            self.alloc_profiler.report()
+            if self.alloc_profiler.dump_path:
+                self.alloc_profiler.dump()
+            self.alloc_profiler.stop()
+        self.finish_recording()
+        self.close_video()
+        self.data.close()
 
 if __name__ == "__main__":
-    game = CyberTyperGame()
+    parser = argparse.ArgumentParser(description="CYBER TYPER: NEON PROTOCOL")
+    parser.add_argument("--profile", metavar="TRACE", help="record per-phase frame timings and save them to a .csv or .json file on exit")
+    parser.add_argument("--pack-assets", action="store_true", help=f"pack sounds and video into {os.path.basename(BUNDLE_PATH)} and exit")
+    parser.add_argument("--fps", type=int, default=FPS, help="target frame rate for the frame limiter and quality governor")
+    parser.add_argument("--quality", choices=["auto"] + [q["name"] for q in QUALITY_LEVELS], default="auto",
+                        help="fixed quality level, or auto to adapt to the target frame rate")
+    parser.add_argument("--low-latency", action="store_true", help="poll input again right before rendering and pace frames without oversleeping")
+    parser.add_argument("--replay", metavar="FILE", help="play back a recorded session from the replays folder")
+    parser.add_argument("--replay-speed", choices=["real", "fast"], default="real", help="play the replay at real speed or as fast as possible")
+    parser.add_argument("--alloc-profile", metavar="TRACE", nargs="?", const="",
+                        help="trace per-frame allocations with tracemalloc, print the top source lines on exit and optionally save a .csv or .json trace")
+    parser.add_argument("--window", metavar="WxH", default=f"{WIDTH}x{HEIGHT}", help="initial window size; the game is scaled to fit and the window can be resized")
+    parser.add_argument("--render-scale", type=float, default=1.0, metavar="SCALE",
+                        help="render the video background and full-screen effects at this fraction of the game resolution (0.25-1.0)")
+    args = parser.parse_args()
+    try:
+        window_size = tuple(int(v) for v in args.window.lower().split("x"))
+        if len(window_size) != 2 or min(window_size) <= 0:
+            raise ValueError
+    except ValueError:
+        parser.error(f"bad --window '{args.window}', expected WIDTHxHEIGHT")
+
+    if args.pack_assets:
+        build_asset_bundle(BUNDLE_PATH, ASSET_FILES)
+        sys.exit()
+
+    game = CyberTyperGame(window_size, args.render_scale)
+    game.set_target_fps(args.fps)
+    game.low_latency = args.low_latency
+    if args.quality != "auto":
+        game.governor.enabled = False
+        game.governor.set_level([q["name"] for q in QUALITY_LEVELS].index(args.quality), " (--quality)")
+    if args.profile:
+        game.profiler.enabled = True
+        game.profiler.dump_path = args.profile
+    if args.alloc_profile is not None:
+        game.alloc_profiler.dump_path = args.alloc_profile or None
+        game.alloc_profiler.start()
+    if args.replay:
+        game.replay = Replay(args.replay)
+        game.replay_fast = args.replay_speed == "fast"
+        game.start_game()
     game.run()
@@ -0,0 +1,275 @@
+import os
+import json
+import time
+import sqlite3
+import argparse
+import threading
+import collections
+
+# Riwayat semua sesi permainan (SQLite, mode WAL)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    accuracy REAL,
+    max_streak INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    keystrokes INTEGER NOT NULL DEFAULT 0,
+    source TEXT NOT NULL DEFAULT 'game'
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_score ON sessions(score DESC);
+CREATE INDEX IF NOT EXISTS idx_sessions_day_score ON sessions(day, score DESC);
+CREATE TABLE IF NOT EXISTS session_analytics (
+    session_id INTEGER PRIMARY KEY REFERENCES sessions(id),
+    wpm REAL,
+    peak_wpm REAL,
+    interkey_p50_ms REAL,
+    word_time_avg REAL,
+    summary TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+SESSION_COLUMNS = ("id", "started_at", "day", "score", "level", "duration", "accuracy",
+                   "max_streak", "hits", "misses", "keystrokes", "source")
+
+class HistoryStore:
+    def __init__(self, filepath):
+        self.filepath = filepath
+        # Koneksi dipakai bareng oleh main thread (baca) dan PersistenceWriter (tulis)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(filepath, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def migrate_legacy_json(self, json_path):
+        # Sekali saja: highscore lama dari game_data.json jadi satu baris sesi 'legacy'
+        if self.get_meta("legacy_json_migrated"):
+            return False
+        highscore = 0
+        started_at = time.time()
+        try:
+            if os.path.exists(json_path):
+                with open(json_path, "r") as f:
+                    highscore = int(json.load(f).get("highscore", 0))
+                started_at = os.path.getmtime(json_path)
+        except Exception as e:
+            print(f"[WARNING] Legacy highscore not migrated: {e}")
+            return False
+
+        with self.lock, self.conn:
+            if highscore > 0:
+                self.conn.execute(
+                    "INSERT INTO sessions (started_at, day, score, level, duration, source) VALUES (?, ?, ?, ?, 0, 'legacy')",
+                    (started_at, time.strftime("%Y-%m-%d", time.localtime(started_at)), highscore, 1 + highscore // 100))
+            self.set_meta("legacy_json_migrated", int(time.time()))
+        print(f"[SYSTEM] Migrated legacy highscore: {highscore}")
+        return True
+
+    def record_session(self, score, level, duration, accuracy=None, max_streak=0, hits=0, misses=0,
+                       keystrokes=0, started_at=None, analytics=None):
+        if started_at is None:
+            started_at = time.time() - duration
+        day = time.strftime("%Y-%m-%d", time.localtime(started_at))
+        with self.lock, self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO sessions (started_at, day, score, level, duration, accuracy, max_streak, hits, misses, keystrokes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (started_at, day, score, level, duration, accuracy, max_streak, hits, misses, keystrokes))
+            if analytics:
+                self.conn.execute(
+                    "INSERT INTO session_analytics (session_id, wpm, peak_wpm, interkey_p50_ms, word_time_avg, summary) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (cur.lastrowid, analytics["wpm"], analytics["peak_wpm"], analytics["interkey_p50_ms"],
+                     analytics["word_time_avg"], json.dumps(analytics)))
+        return cur.lastrowid
+
+    def analytics(self, session_id):
+        with self.lock:
+            row = self.conn.execute("SELECT summary FROM session_analytics WHERE session_id = ?", (session_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def wpm_trend(self, n=20):
+        # WPM sesi-sesi terakhir, lama ke baru
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT s.started_at, a.wpm FROM session_analytics a JOIN sessions s ON s.id = a.session_id "
+                "ORDER BY s.started_at DESC LIMIT ?", (n,)).fetchall()
+        return list(reversed(rows))
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def highscore(self):
+        with self.lock:
+            row = self.conn.execute("SELECT MAX(score) FROM sessions").fetchone()
+        return row[0] or 0
+
+    def top_n(self, n=10):
+        with self.lock:
+            rows = self.conn.execute(f"SELECT {', '.join(SESSION_COLUMNS)} FROM sessions ORDER BY score DESC LIMIT ?", (n,)).fetchall()
+        return [dict(zip(SESSION_COLUMNS, row)) for row in rows]
+
+    def best_per_day(self, days=30):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT day, MAX(score), COUNT(*) FROM sessions GROUP BY day ORDER BY day DESC LIMIT ?", (days,)).fetchall()
+        return [{"day": day, "best": best, "sessions": count} for day, best, count in rows]
+
+    def percentile_of(self, score):
+        with self.lock:
+            total = self.count()
+            if total == 0:
+                return 100.0
+            below = self.conn.execute("SELECT COUNT(*) FROM sessions WHERE score < ?", (score,)).fetchone()[0]
+        return below * 100.0 / total
+
+    def score_at_percentile(self, pct):
+        with self.lock:
+            total = self.count()
+            if total == 0:
+                return 0
+            offset = min(total - 1, int(pct / 100.0 * total))
+            row = self.conn.execute("SELECT score FROM sessions ORDER BY score LIMIT 1 OFFSET ?", (offset,)).fetchone()
+        return row[0]
+
+def atomic_write_json(path, data):
+    # Tulis ke file sementara lalu rename: file lama utuh sampai file baru benar-benar di disk
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+class PersistenceWriter:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.jobs = collections.deque()
+        self.snapshots = {}
+        self.busy = False
+        self.closed = False
+        self.writes = 0
+        self.coalesced = 0
+        self.thread = threading.Thread(target=self._run, name="PersistenceWriter", daemon=True)
+        self.thread.start()
+
+    def submit(self, func, *args):
+        with self.cond:
+            self.jobs.append((func, args))
+            self.cond.notify()
+
+    def save_json(self, path, data):
+        # Snapshot ke path yang sama digabung, yang ditulis cuma versi terakhir
+        with self.cond:
+            if path in self.snapshots:
+                self.coalesced += 1
+            self.snapshots[path] = data
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.jobs and not self.snapshots and not self.closed:
+                    self.cond.wait()
+                if self.closed and not self.jobs and not self.snapshots:
+                    return
+                jobs = list(self.jobs)
+                self.jobs.clear()
+                snapshots = self.snapshots
+                self.snapshots = {}
+                self.busy = True
+
+            for func, args in jobs:
+                try:
+                    func(*args)
+                    self.writes += 1
+                except Exception as e:
+                    print(f"[ERROR] Background write failed: {e}")
+            for path, data in snapshots.items():
+                try:
+                    atomic_write_json(path, data)
+                    self.writes += 1
+                except Exception as e:
+                    print(f"[ERROR] Failed to save {path}: {e}")
+
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()
+
+    def flush(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            while self.jobs or self.snapshots or self.busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def close(self, timeout=5.0):
+        flushed = self.flush(timeout)
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join(timeout)
+        if not flushed:
+            print("[WARNING] Persistence writer closed with pending writes")
+        return flushed
+
+def main():
+    parser = argparse.ArgumentParser(description="CYBER TYPER session history")
+    parser.add_argument("--db", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_data.db"))
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    store = HistoryStore(args.db)
+    print(f"[HISTORY] {store.count()} sessions, highscore {store.highscore()}")
+    print(f"[HISTORY] p50 {store.score_at_percentile(50)}  p90 {store.score_at_percentile(90)}  p99 {store.score_at_percentile(99)}")
+    for i, row in enumerate(store.top_n(args.top), 1):
+        print(f"{i:>3}. {row['score']:>6}  level {row['level']:>2}  {row['duration']:>6.1f}s  {row['day']}  {row['source']}")
+    for row in store.best_per_day(args.days):
+        print(f"{row['day']}  best {row['best']:>6}  ({row['sessions']} sessions)")
+    trend = store.wpm_trend()
+    if trend:
+        print("[HISTORY] WPM trend: " + " ".join(f"{wpm:.0f}" for _, wpm in trend))
+    store.close()
+
+if __name__ == "__main__":
+    main()
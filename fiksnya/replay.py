@@ -0,0 +1,195 @@
+import os
+import time
+import struct
+import argparse
+
+from simulation import GameSimulation, SIM_HZ, SIM_STEP
+
+# Rekaman sesi: seed + tombol per tick simulasi, cukup untuk mengulang sesi persis sama
+#
+# Format: HEADER, lalu record (selisih tick varint, 1 byte tombol) sampai byte END,
+# lalu TRAILER berisi hasil akhir untuk verifikasi saat diputar ulang.
+
+MAGIC = b"CTRP"
+# 3: kata meteor diambil dari stream acak "words" terpisah, rekaman versi lama tidak bisa diputar ulang sama persis
+VERSION = 3
+# Tombol di luar 1 byte (huruf non-ASCII, tetap dihitung typo): byte WIDE lalu code point varint
+WIDE = 0xFF
+# magic, versi, seed, checksum kamus kata, waktu mulai
+HEADER = struct.Struct("<4sHQId")
+# skor, level, tick terakhir
+TRAILER = struct.Struct("<iII")
+END = 0
+
+MAX_REPLAYS = 50
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class ReplayRecorder:
+    def __init__(self, filepath, seed, words_checksum=0):
+        self.filepath = filepath
+        self.seed = seed
+        self.last_tick = 0
+        self.keys = 0
+        self.record = bytearray()
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        # Buffer file bawaan Python: tulis ke disk per beberapa KB, bukan per tombol
+        self.file = open(filepath, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, words_checksum, time.time()))
+
+    def press(self, tick, key):
+        record = self.record
+        write_varint(record, tick - self.last_tick)
+        code = ord(key)
+        if code < WIDE:
+            record.append(code)
+        else:
+            record.append(WIDE)
+            write_varint(record, code)
+        self.last_tick = tick
+        self.keys += 1
+        self.file.write(record)
+        record.clear()
+
+    def finish(self, result=None):
+        if self.file is None:
+            return
+        if result is not None:
+            self.file.write(bytes([0, END]))
+            self.file.write(TRAILER.pack(result["score"], result["level"], result["ticks"]))
+        self.file.close()
+        self.file = None
+
+class Replay:
+    def __init__(self, filepath):
+        self.filepath = filepath
+        with open(filepath, "rb") as f:
+            data = f.read()
+        magic, version, self.seed, self.words_checksum, self.started_at = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"not a replay file: {filepath}")
+        if version != VERSION:
+            raise ValueError(f"replay version {version} is not supported (expected {VERSION}): {filepath}")
+
+        # (tick, tombol) urut waktu
+        self.events = []
+        self.expected = None
+        tick = 0
+        pos = HEADER.size
+        try:
+            while pos < len(data):
+                delta, pos = read_varint(data, pos)
+                key = data[pos]
+                pos += 1
+                if key == END:
+                    score, level, ticks = TRAILER.unpack_from(data, pos)
+                    self.expected = {"score": score, "level": level, "ticks": ticks}
+                    break
+                if key == WIDE:
+                    key, pos = read_varint(data, pos)
+                tick += delta
+                self.events.append((tick, chr(key)))
+        except (IndexError, struct.error):
+            # Rekaman terpotong (game crash / ditutup paksa): yang sudah terbaca tetap bisa diputar
+            pass
+        self.cursor = 0
+
+    @property
+    def duration(self):
+        if self.expected:
+            return self.expected["ticks"] * SIM_STEP
+        return self.events[-1][0] * SIM_STEP if self.events else 0.0
+
+    def rewind(self):
+        self.cursor = 0
+
+    def apply(self, sim):
+        # Dipanggil tepat sebelum sim.step(): semua tombol yang jatuh di tick ini ditekan dulu
+        events = self.events
+        while self.cursor < len(events) and events[self.cursor][0] <= sim.tick:
+            sim.press(events[self.cursor][1])
+            self.cursor += 1
+
+    def finished(self, sim):
+        return self.cursor >= len(self.events) and (self.expected is None or sim.tick >= self.expected["ticks"])
+
+    def verify(self, result):
+        if self.expected is None:
+            return None
+        return all(result[k] == v for k, v in self.expected.items())
+
+def replay_path(directory, started_at=None):
+    stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(started_at or time.time()))
+    path = os.path.join(directory, f"session_{stamp}.ctr")
+    n = 1
+    while os.path.exists(path):
+        n += 1
+        path = os.path.join(directory, f"session_{stamp}_{n}.ctr")
+    return path
+
+def prune_replays(directory, keep=MAX_REPLAYS):
+    try:
+        files = sorted(f for f in os.listdir(directory) if f.endswith(".ctr"))
+    except OSError:
+        return
+    for name in files[:-keep] if keep else files:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+
+def run_replay(replay, words=None, max_seconds=3600):
+    sim = GameSimulation(words=words, seed=replay.seed)
+    if replay.words_checksum and sim.dictionary.checksum() != replay.words_checksum:
+        print("[WARNING] Word dictionary differs from the one used for this replay")
+    max_ticks = int(max_seconds * SIM_HZ)
+    while not sim.over and sim.tick < max_ticks and not replay.finished(sim):
+        replay.apply(sim)
+        sim.step()
+        sim.events.clear()
+    return sim.result()
+
+def main():
+    from dictionary import WordDictionary
+
+    parser = argparse.ArgumentParser(description="Replay a recorded CYBER TYPER session headless, as fast as possible")
+    parser.add_argument("replay")
+    parser.add_argument("--words", help="word dictionary used when the session was recorded")
+    args = parser.parse_args()
+
+    replay = Replay(args.replay)
+    words = WordDictionary.load(args.words) if args.words else None
+    print(f"[REPLAY] seed {replay.seed}, {len(replay.events)} keys, {replay.duration:.1f}s of play")
+
+    start = time.perf_counter()
+    result = run_replay(replay, words)
+    elapsed = time.perf_counter() - start
+    print(f"[REPLAY] score {result['score']}  level {result['level']}  {result['seconds']:.1f}s "
+          f"(replayed in {elapsed:.2f}s, {result['seconds'] / max(elapsed, 1e-9):.0f}x real time)")
+
+    verified = replay.verify(result)
+    if verified is None:
+        print("[REPLAY] Recording has no final result (session did not finish), not verified")
+    elif verified:
+        print("[REPLAY] Result matches the recording")
+    else:
+        print(f"[REPLAY] MISMATCH, recorded {replay.expected}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import sys
+import random
+import argparse
+
+from simulation import BotTypist
+from server import Round, Session
+
+# Cek jadwal spawn ronde server: bot dengan kecepatan berbeda di ronde yang sama harus mendapat
+# urutan kata, x, dan kecepatan meteor yang sama, berapa pun skor & ketikan masing-masing.
+# Keluar dengan kode 1 kalau ada yang beda.
+
+def play(game_round, words, wpm, accuracy, seconds, bot_seed):
+    session = Session(0, "bot", None, game_round, words)
+    sim = session.sim
+    bot = BotTypist(wpm=wpm, accuracy=accuracy, rng=random.Random(bot_seed))
+    spawns = []
+    while not sim.over and sim.tick < seconds * 60:
+        key = bot.act(sim)
+        if key is not None:
+            sim.press(key)
+        sim.step()
+        for meteor in sim.spawned:
+            spawns.append((meteor.spawn_tick, meteor.text, meteor.x, meteor.base_speed))
+        sim.spawned.clear()
+        sim.events.clear()
+    return spawns
+
+def first_difference(a, b):
+    for n, (left, right) in enumerate(zip(a, b)):
+        if left[1:] != right[1:]:
+            return n, left, right
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every player in a server round gets the same spawn sequence")
+    parser.add_argument("--seeds", type=int, default=50, help="rounds to check")
+    parser.add_argument("--wpm", type=float, nargs="+", default=[30, 90])
+    parser.add_argument("--accuracy", type=float, default=0.9)
+    parser.add_argument("--seconds", type=float, default=120)
+    args = parser.parse_args()
+
+    failures = 0
+    for seed in range(args.seeds):
+        game_round = Round(seed, seed)
+        runs = [play(game_round, None, wpm, args.accuracy, args.seconds, seed * 31 + i) for i, wpm in enumerate(args.wpm)]
+        for wpm, spawns in zip(args.wpm[1:], runs[1:]):
+            diff = first_difference(runs[0], spawns)
+            if diff is None:
+                continue
+            failures += 1
+            if failures == 1:
+                n, left, right = diff
+                print(f"[CHECK] Seed {seed}: spawn {n} differs between {args.wpm[0]:g} and {wpm:g} WPM "
+                      f"(tick {left[0]} '{left[1]}' vs tick {right[0]} '{right[1]}')")
+    if failures:
+        print(f"[CHECK] Spawn sequence differs between bots in {failures} round(s) of {args.seeds}")
+        sys.exit(1)
+    print(f"[CHECK] Bots at {', '.join(f'{w:g}' for w in args.wpm)} WPM got the same spawn sequence in all {args.seeds} rounds")
+
+if __name__ == "__main__":
+    main()
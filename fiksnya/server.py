@@ -0,0 +1,488 @@
+import time
+import random
+import struct
+import asyncio
+import argparse
+import bisect
+
+from simulation import (GameSimulation, SimMeteor, Difficulty, RandomStreams, make_dictionary, WIDTH, SIM_HZ, SIM_STEP,
+                        KEY_BACKSPACE, new_seed)
+from dictionary import WordDictionary
+
+# Server multiplayer: banyak sesi GameSimulation dalam satu proses asyncio, satu loop tick untuk semua sesi.
+#
+# Protokol: tiap pesan = panjang (u16) + tipe (u8) + isi. Server cuma mengirim perubahan
+# (meteor muncul/hilang, skor/HP/buffer berubah); posisi meteor dihitung sendiri oleh client
+# dari tick spawn dan kecepatannya.
+
+DEFAULT_PORT = 7777
+
+FRAME = struct.Struct("<H")
+
+# client -> server
+MSG_JOIN = 0x01       # nama pemain (utf-8)
+MSG_KEY = 0x02        # satu atau lebih tombol (utf-8; huruf non-ASCII = typo)
+
+# server -> client
+MSG_WELCOME = 0x81
+MSG_SPAWN = 0x82
+MSG_REMOVE = 0x83
+MSG_STATE = 0x84
+MSG_GAMEOVER = 0x85
+
+WELCOME = struct.Struct("<BIIQI")       # session id, round id, seed, tick
+SPAWN = struct.Struct("<BIIhf")         # meteor id, tick spawn, x, kecepatan (+ kata)
+REMOVE = struct.Struct("<BIB")          # meteor id, alasan
+STATE = struct.Struct("<BIihHH")        # tick, skor, HP, streak, level (+ buffer ketikan)
+GAMEOVER = struct.Struct("<BiHIIHH")    # skor, level, tick, hits, rank di ronde, jumlah selesai di ronde
+
+REMOVE_HIT = 0
+REMOVE_DAMAGE = 1
+
+# Huruf depan kata jadwal tidak mengulang huruf depan sekian kata sebelumnya (perkiraan meteor yang masih di layar)
+SCHEDULE_RECENT = 4
+
+# Tick tertinggal lebih dari ini dikejar sekaligus, sisanya dibuang
+MAX_CATCHUP_TICKS = 5
+STATS_INTERVAL = 5.0
+
+def frame(payload):
+    return FRAME.pack(len(payload)) + payload
+
+def encode_spawn(meteor):
+    return frame(SPAWN.pack(MSG_SPAWN, meteor.id, meteor.spawn_tick, int(meteor.x), meteor.base_speed) + meteor.text.encode("ascii"))
+
+def encode_state(sim):
+    stats = sim.stats
+    return frame(STATE.pack(MSG_STATE, sim.tick, stats.score, stats.health, stats.streak, sim.level_manager.level)
+                 + sim.input_buffer.encode("utf-8"))
+
+def split_frames(buffer):
+    # Potong bytearray jadi pesan-pesan utuh; sisa yang belum lengkap tetap di buffer
+    messages = []
+    pos = 0
+    end = len(buffer)
+    while end - pos >= FRAME.size:
+        (length,) = FRAME.unpack_from(buffer, pos)
+        if end - pos - FRAME.size < length:
+            break
+        start = pos + FRAME.size
+        messages.append(bytes(buffer[start:start + length]))
+        pos = start + length
+    del buffer[:pos]
+    return messages
+
+def meteor_y(spawn_tick, speed, tick):
+    # Sama dengan SimMeteor: mulai di -60, maju sekali di tick spawn-nya
+    return -60 + speed * (tick - spawn_tick + 1)
+
+class NetMeteor(SimMeteor):
+    __slots__ = ("id", "spawn_tick")
+
+class SpawnSchedule:
+    # Urutan spawn satu ronde: spawn ke-n (kata, x, kecepatan) cuma bergantung pada seed ronde & n.
+    # Skor, ketikan, dan meteor di layar pemain tidak ikut, jadi semua pemain di ronde yang sama
+    # mendapat kata yang sama; yang beda antar pemain hanya kapan spawn itu datang.
+    # Dibuat bertahap sesuai kebutuhan pemain yang paling jauh.
+    def __init__(self, seed, words=None, difficulty=None, width=WIDTH):
+        streams = RandomStreams(seed)
+        self.rng = streams.stream("sim")
+        self.word_rng = streams.stream("words")
+        self.dictionary = make_dictionary(words)
+        self.difficulty = difficulty or Difficulty()
+        self.width = width
+        self.entries = []
+
+    def level(self, index):
+        # Level kalau semua meteor sebelumnya kena: kesulitan tetap naik sepanjang ronde tanpa status pemain
+        d = self.difficulty
+        return 1 + index * d.hit_score // d.score_per_level
+
+    def get(self, index):
+        while len(self.entries) <= index:
+            self.entries.append(self.generate(len(self.entries)))
+        return self.entries[index]
+
+    def generate(self, index):
+        d = self.difficulty
+        level = self.level(index)
+        x = self.rng.randint(50, self.width - 150)
+        speed = self.rng.uniform(d.speed_min, d.speed_max) + level * d.speed_per_level
+        blocked = {word[0] for word, _, _ in self.entries[-SCHEDULE_RECENT:]}
+        word = self.dictionary.pick(level, self.word_rng, blocked)
+        return word, x, speed
+
+class SessionSimulation(GameSimulation):
+    # Meteor dari pool bisa objek lama, jadi id & tick spawn diberikan di sini, bukan di factory
+    def __init__(self, schedule, **kwargs):
+        self.schedule = schedule
+        self.spawned = []
+        self.next_meteor_id = 0
+        super().__init__(meteor_factory=NetMeteor, **kwargs)
+
+    def next_spawn(self):
+        return self.schedule.get(self.next_meteor_id)
+
+    def spawn_meteor(self):
+        meteor = super().spawn_meteor()
+        meteor.id = self.next_meteor_id
+        meteor.spawn_tick = self.tick
+        self.next_meteor_id += 1
+        self.spawned.append(meteor)
+        return meteor
+
+class Round:
+    def __init__(self, round_id, seed, words=None):
+        self.id = round_id
+        self.seed = seed
+        self.schedule = SpawnSchedule(seed, words)
+        self.started_at = time.monotonic()
+        self.sessions = 0
+        # Skor negatif disimpan supaya bisect langsung memberi ranking
+        self.finished = []
+
+    def finish(self, score):
+        bisect.insort(self.finished, -score)
+        return bisect.bisect_left(self.finished, -score) + 1, len(self.finished)
+
+class Session:
+    __slots__ = ("id", "name", "conn", "round", "sim", "keys", "dirty")
+
+    def __init__(self, session_id, name, conn, game_round, words):
+        self.id = session_id
+        self.name = name
+        self.conn = conn
+        self.round = game_round
+        self.keys = []
+        self.dirty = True
+        self.sim = SessionSimulation(game_round.schedule, words=words, seed=game_round.seed)
+
+class ClientConnection(asyncio.Protocol):
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.buffer = bytearray()
+        self.session = None
+        self.name = ""
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.connections += 1
+
+    def connection_lost(self, exc):
+        self.server.connections -= 1
+        self.server.end_session(self)
+
+    def data_received(self, data):
+        self.buffer += data
+        for message in split_frames(self.buffer):
+            kind = message[0]
+            if kind == MSG_KEY:
+                if self.session:
+                    self.session.keys.extend(message[1:].decode("utf-8", "ignore"))
+            elif kind == MSG_JOIN:
+                self.name = message[1:].decode("utf-8", "replace")[:32]
+                self.server.start_session(self)
+
+    def send(self, data):
+        if not self.transport.is_closing():
+            self.transport.write(data)
+
+class GameServer:
+    def __init__(self, words=None, round_seconds=30.0, store=None, writer=None):
+        self.words = words
+        self.round_seconds = round_seconds
+        self.store = store
+        self.writer = writer
+        self.sessions = {}
+        self.next_session_id = 1
+        self.round = None
+        self.next_round_id = 1
+        self.connections = 0
+        self.tick = 0
+        self.tick_times = []
+        self.games_finished = 0
+        self.bytes_sent = 0
+
+    def current_round(self):
+        # Yang masuk dalam jendela round_seconds yang sama main dengan seed yang sama
+        now = time.monotonic()
+        if self.round is None or now - self.round.started_at >= self.round_seconds:
+            self.round = Round(self.next_round_id, new_seed(), self.words)
+            self.next_round_id += 1
+        return self.round
+
+    def start_session(self, conn):
+        self.end_session(conn)
+        game_round = self.current_round()
+        session = Session(self.next_session_id, conn.name, conn, game_round, self.words)
+        self.next_session_id += 1
+        game_round.sessions += 1
+        conn.session = session
+        self.sessions[session.id] = session
+        conn.send(frame(WELCOME.pack(MSG_WELCOME, session.id, game_round.id, game_round.seed, session.sim.tick)))
+
+    def end_session(self, conn):
+        if conn.session is not None:
+            self.sessions.pop(conn.session.id, None)
+            conn.session = None
+
+    def step_session(self, session):
+        sim = session.sim
+        if session.keys:
+            for key in session.keys:
+                sim.press(key)
+            session.keys.clear()
+            session.dirty = True
+
+        sim.step()
+
+        out = []
+        for meteor in sim.spawned:
+            out.append(encode_spawn(meteor))
+        sim.spawned.clear()
+
+        result = None
+        for kind, meteor in sim.drain_events():
+            if kind == "hit":
+                out.append(frame(REMOVE.pack(MSG_REMOVE, meteor.id, REMOVE_HIT)))
+            elif kind == "damage":
+                out.append(frame(REMOVE.pack(MSG_REMOVE, meteor.id, REMOVE_DAMAGE)))
+            elif kind == "gameover":
+                result = sim.result()
+            session.dirty = True
+
+        if session.dirty:
+            out.append(encode_state(sim))
+            session.dirty = False
+
+        if result is not None:
+            out.append(self.finish_session(session, result))
+
+        if out:
+            data = b"".join(out)
+            self.bytes_sent += len(data)
+            session.conn.send(data)
+
+    def finish_session(self, session, result):
+        rank, finished = session.round.finish(result["score"])
+        self.games_finished += 1
+        self.sessions.pop(session.id, None)
+        session.conn.session = None
+        if self.store is not None:
+            self.writer.submit(self.store.record_session, result["score"], result["level"], result["seconds"],
+                               result["accuracy"], result["max_streak"], result["hits"], result["misses"], result["keystrokes"])
+        return frame(GAMEOVER.pack(MSG_GAMEOVER, result["score"], result["level"], result["ticks"], result["hits"],
+                                   min(rank, 0xFFFF), min(finished, 0xFFFF)))
+
+    def step_all(self):
+        start = time.perf_counter()
+        for session in list(self.sessions.values()):
+            self.step_session(session)
+        self.tick += 1
+        self.tick_times.append(time.perf_counter() - start)
+
+    def report(self, interval):
+        times = sorted(self.tick_times)
+        self.tick_times = []
+        if not times:
+            return
+        mean = sum(times) / len(times)
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        load = mean / SIM_STEP
+        capacity = len(self.sessions) / load if load > 0 else 0
+        print(f"[SERVER] {len(self.sessions)} sessions, {self.connections} clients | tick mean {mean * 1000:.2f} ms "
+              f"p95 {p95 * 1000:.2f} ms | load {load * 100:.0f}% (~{capacity:.0f} sessions/core) | "
+              f"{self.bytes_sent / interval / 1024:.0f} KB/s out | {self.games_finished} games finished")
+        self.bytes_sent = 0
+
+    async def run_ticks(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        next_report = next_tick + STATS_INTERVAL
+        while True:
+            now = loop.time()
+            behind = int((now - next_tick) / SIM_STEP)
+            if behind > MAX_CATCHUP_TICKS:
+                next_tick = now - MAX_CATCHUP_TICKS * SIM_STEP
+            while next_tick <= now:
+                self.step_all()
+                next_tick += SIM_STEP
+            if now >= next_report:
+                self.report(STATS_INTERVAL)
+                next_report = now + STATS_INTERVAL
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    async def serve(self, host, port):
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: ClientConnection(self), host, port)
+        print(f"[SERVER] Listening on {host}:{port} ({SIM_HZ} ticks/s)")
+        async with server:
+            await self.run_ticks()
+
+class MirrorClient:
+    # Salinan state di sisi client, cukup dari pesan server (dipakai client pygame dan load test)
+    def __init__(self):
+        self.session_id = 0
+        self.round_id = 0
+        self.seed = 0
+        self.meteors = {}
+        self.tick = 0
+        self.tick_time = time.monotonic()
+        self.score = 0
+        self.health = 100
+        self.streak = 0
+        self.level = 1
+        self.buffer = ""
+        self.result = None
+
+    def sync_tick(self, tick):
+        self.tick = tick
+        self.tick_time = time.monotonic()
+
+    def current_tick(self):
+        return self.tick + (time.monotonic() - self.tick_time) * SIM_HZ
+
+    def handle(self, message):
+        kind = message[0]
+        if kind == MSG_SPAWN:
+            _, meteor_id, spawn_tick, x, speed = SPAWN.unpack_from(message)
+            self.meteors[meteor_id] = (message[SPAWN.size:].decode("ascii"), x, speed, spawn_tick)
+        elif kind == MSG_REMOVE:
+            _, meteor_id, reason = REMOVE.unpack(message)
+            self.meteors.pop(meteor_id, None)
+        elif kind == MSG_STATE:
+            _, tick, self.score, self.health, self.streak, self.level = STATE.unpack_from(message)
+            self.buffer = message[STATE.size:].decode("utf-8", "replace")
+            self.sync_tick(tick)
+        elif kind == MSG_WELCOME:
+            _, self.session_id, self.round_id, self.seed, tick = WELCOME.unpack(message)
+            self.meteors.clear()
+            self.buffer = ""
+            self.result = None
+            self.sync_tick(tick)
+        elif kind == MSG_GAMEOVER:
+            _, score, level, ticks, hits, rank, finished = GAMEOVER.unpack(message)
+            self.result = {"score": score, "level": level, "ticks": ticks, "hits": hits, "rank": rank, "finished": finished}
+        return kind
+
+    def lowest_meteor(self):
+        tick = self.current_tick()
+        best = None
+        best_y = None
+        for word, x, speed, spawn_tick in self.meteors.values():
+            y = meteor_y(spawn_tick, speed, tick)
+            if best_y is None or y > best_y:
+                best, best_y = word, y
+        return best
+
+async def read_message(reader):
+    (length,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return await reader.readexactly(length)
+
+async def bot_client(host, port, wpm, accuracy, duration, stats, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(frame(bytes([MSG_JOIN]) + b"bot"))
+    mirror = MirrorClient()
+    interval = 60.0 / (wpm * 5)
+    deadline = time.monotonic() + duration
+
+    async def typer():
+        while True:
+            await asyncio.sleep(interval * rng.uniform(0.8, 1.2))
+            target = mirror.lowest_meteor()
+            if target is None or mirror.result is not None:
+                continue
+            buffer = mirror.buffer
+            if not target.startswith(buffer):
+                key = KEY_BACKSPACE
+            elif len(buffer) >= len(target):
+                continue
+            elif rng.random() > accuracy:
+                key = rng.choice("abcdefghijklmnopqrstuvwxyz")
+            else:
+                key = target[len(buffer)]
+            writer.write(frame(bytes([MSG_KEY]) + key.encode("ascii")))
+            stats["keys"] += 1
+
+    typing = asyncio.ensure_future(typer())
+    try:
+        while time.monotonic() < deadline:
+            try:
+                message = await asyncio.wait_for(read_message(reader), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                break
+            stats["messages"] += 1
+            stats["bytes"] += len(message) + FRAME.size
+            if mirror.handle(message) == MSG_GAMEOVER:
+                stats["games"] += 1
+                stats["scores"].append(mirror.result["score"])
+                writer.write(frame(bytes([MSG_JOIN]) + b"bot"))
+    finally:
+        typing.cancel()
+        writer.close()
+
+async def load_test(host, port, clients, duration, wpm, accuracy, seed):
+    stats = {"messages": 0, "bytes": 0, "games": 0, "keys": 0, "scores": []}
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(clients):
+        tasks.append(asyncio.ensure_future(bot_client(host, port, wpm, accuracy, duration, stats, random.Random(rng.random()))))
+        if i % 50 == 49:
+            await asyncio.sleep(0.05)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    errors = [r for r in results if isinstance(r, Exception)]
+
+    scores = sorted(stats["scores"])
+    print(f"[LOADTEST] {clients} clients for {duration:.0f}s: {stats['messages'] / duration:.0f} msgs/s, "
+          f"{stats['bytes'] / duration / 1024:.0f} KB/s in, {stats['keys'] / duration:.0f} keys/s out")
+    if scores:
+        print(f"[LOADTEST] {stats['games']} games finished, median score {scores[len(scores) // 2]}")
+    if errors:
+        print(f"[LOADTEST] {len(errors)} clients failed, first error: {errors[0]!r}")
+
+def main():
+    parser = argparse.ArgumentParser(description="CYBER TYPER multiplayer server")
+    sub = parser.add_subparsers(dest="command")
+    serve = sub.add_parser("serve", help="host game sessions (default)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--round-seconds", type=float, default=30.0, help="players joining within this window share a seed")
+    serve.add_argument("--words", help="word dictionary built with dictionary.py")
+    serve.add_argument("--db", help="record finished sessions to this history database")
+    load = sub.add_parser("loadtest", help="connect many bot clients to a running server")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, default=DEFAULT_PORT)
+    load.add_argument("--clients", type=int, default=500)
+    load.add_argument("--seconds", type=float, default=30.0)
+    load.add_argument("--wpm", type=float, default=40)
+    load.add_argument("--accuracy", type=float, default=0.95)
+    load.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "loadtest":
+        asyncio.run(load_test(args.host, args.port, args.clients, args.seconds, args.wpm, args.accuracy, args.seed))
+        return
+
+    if args.command is None:
+        args = parser.parse_args(["serve"])
+
+    words = WordDictionary.load(args.words) if args.words else None
+    store = writer = None
+    if args.db:
+        from history import HistoryStore, PersistenceWriter
+        store = HistoryStore(args.db)
+        writer = PersistenceWriter()
+
+    server = GameServer(words=words, round_seconds=args.round_seconds, store=store, writer=writer)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store is not None:
+            writer.close()
+            store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,611 @@
+import random
+import time
+import argparse
+
+from dictionary import WordDictionary
+
+# Inti logika game tanpa pygame: dipakai game.py, mode headless, dan tool lain
+
+SIM_HZ = 60
+SIM_STEP = 1.0 / SIM_HZ
+
+WIDTH, HEIGHT = 900, 700
+
+HIT_SCORE = 10
+PANIC_PENALTY = 5
+METEOR_DAMAGE = 20
+STREAK_HEAL = 10
+STREAK_BONUS_EVERY = 5
+
+# Semua angka balancing di satu tempat; sweep.py mengubah-ubah nilai ini
+DIFFICULTY_DEFAULTS = {
+    "score_per_level": 100,
+    "spawn_delay_base": 90,
+    "spawn_delay_step": 5,
+    "spawn_delay_min": 20,
+    "speed_min": 1.0,
+    "speed_max": 2.0,
+    "speed_per_level": 0.3,
+    "hit_score": HIT_SCORE,
+    "panic_penalty": PANIC_PENALTY,
+    "meteor_damage": METEOR_DAMAGE,
+    "streak_heal": STREAK_HEAL,
+    "streak_bonus_every": STREAK_BONUS_EVERY,
+}
+
+KEY_BACKSPACE = "\b"
+KEY_ENTER = "\n"
+KEY_ESCAPE = "\x1b"
+
+DEFAULT_WORDS = ["system", "hacker", "protocol", "circuit", "binary",
+                 "cyber", "neon", "matrix", "linux", "python", "script",
+                 "server", "proxy", "firewall", "encryption", "node", "data",
+                 "java", "object", "class", "void", "public", "static",
+                 "terminal", "root", "sudo", "apt", "kernel", "bios"]
+
+class RandomStreams:
+    # Satu seed sesi -> stream acak terpisah per subsistem (sim, shake, partikel, ...),
+    # jadi efek visual tidak menggeser urutan angka acak simulasi
+    def __init__(self, seed=None):
+        self.seed = seed if seed is not None else new_seed()
+
+    def stream(self, name):
+        return random.Random(f"{self.seed}:{name}")
+
+    def int_seed(self, name):
+        return self.stream(name).getrandbits(64)
+
+def new_seed():
+    return random.SystemRandom().getrandbits(63)
+
+_default_dictionary = None
+
+def default_dictionary():
+    global _default_dictionary
+    if _default_dictionary is None:
+        _default_dictionary = WordDictionary.from_words(DEFAULT_WORDS)
+    return _default_dictionary
+
+def make_dictionary(words=None):
+    # words: WordDictionary, list kata, atau None untuk DEFAULT_WORDS
+    if words is None:
+        return default_dictionary()
+    if isinstance(words, WordDictionary):
+        return words
+    return WordDictionary.from_words(words)
+
+class Difficulty:
+    def __init__(self, **overrides):
+        for name, default in DIFFICULTY_DEFAULTS.items():
+            setattr(self, name, overrides.pop(name, default))
+        if overrides:
+            raise TypeError(f"unknown difficulty parameter: {', '.join(overrides)}")
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in DIFFICULTY_DEFAULTS}
+
+    def replace(self, **overrides):
+        return Difficulty(**dict(self.as_dict(), **overrides))
+
+class LevelManager:
+    def __init__(self, difficulty=None):
+        self.difficulty = difficulty or Difficulty()
+        self.level = 1
+
+    def check_level_up(self, current_score):
+        calculated_level = 1 + (current_score // self.difficulty.score_per_level)
+        if calculated_level > self.level:
+            self.level = calculated_level
+            return True
+        return False
+
+    def get_spawn_delay(self):
+        d = self.difficulty
+        return max(d.spawn_delay_min, d.spawn_delay_base - (self.level * d.spawn_delay_step))
+
+    def get_speed_multiplier(self):
+        return self.level * self.difficulty.speed_per_level
+
+class PlayerStats:
+    def __init__(self):
+        self.__score = 0
+        self.__health = 100
+        self.__max_health = 100
+        self.__streak = 0
+        self.__max_streak = 0
+
+    @property
+    def score(self):
+        return self.__score
+    @property
+    def health(self):
+        return self.__health
+    @property
+    def streak(self):
+        return self.__streak
+    @property
+    def max_streak(self):
+        return self.__max_streak
+
+    def reset_stats(self):
+        self.__score = 0
+        self.__health = self.__max_health
+        self.__streak = 0
+        self.__max_streak = 0
+
+    def add_score(self, amount):
+        self.__score += amount
+
+    def take_damage(self, amount):
+        self.__health -= amount
+        self.reset_streak()
+
+    def heal(self, amount):
+        self.__health += amount
+        if self.__health > self.__max_health:
+            self.__health = self.__max_health
+
+    def is_alive(self):
+        return self.__health > 0
+
+    def increment_streak(self, bonus_every=STREAK_BONUS_EVERY):
+        self.__streak += 1
+        if self.__streak > self.__max_streak:
+            self.__max_streak = self.__streak
+        if self.__streak > 0 and self.__streak % bonus_every == 0:
+            return True
+        return False
+
+    def reset_streak(self):
+        self.__streak = 0
+
+class EntityStore:
+    # List padat + indeks slot di tiap entity: hapus = tukar dengan elemen terakhir, O(1).
+    # Urutan tidak dipertahankan setelah ada yang dihapus.
+    def __init__(self):
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add(self, entity):
+        entity.slot = len(self.items)
+        self.items.append(entity)
+        return entity
+
+    def remove(self, entity):
+        items = self.items
+        slot = entity.slot
+        if slot < 0 or slot >= len(items) or items[slot] is not entity:
+            return False
+        last = items.pop()
+        if last is not entity:
+            items[slot] = last
+            last.slot = slot
+        entity.slot = -1
+        return True
+
+    def clear(self):
+        for entity in self.items:
+            entity.slot = -1
+        self.items.clear()
+
+class EntityPool:
+    # Objek yang sudah mati dipakai lagi lewat reset(), jadi tidak ada alokasi baru saat main
+    def __init__(self, factory, max_free=256):
+        self.factory = factory
+        self.max_free = max_free
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+            self.reused += 1
+            return entity
+        self.created += 1
+        return self.factory(*args)
+
+    def release(self, entity):
+        if len(self.free) < self.max_free:
+            self.free.append(entity)
+
+class SimMeteor:
+    __slots__ = ("text", "x", "y", "prev_x", "prev_y", "base_speed", "slot")
+
+    def __init__(self, text, x, base_speed):
+        self.reset(text, x, base_speed)
+
+    def reset(self, text, x, base_speed):
+        self.slot = -1
+        self.text = text
+        self.x = x
+        self.y = -60
+        self.prev_x = x
+        self.prev_y = self.y
+        self.base_speed = base_speed
+
+    def update(self):
+        self.prev_y = self.y
+        self.y += self.base_speed
+
+    def set_highlight(self, active):
+        pass
+
+class TrieNode:
+    __slots__ = ("children", "meteors", "ends")
+
+    def __init__(self):
+        self.children = {}
+        # dict dipakai sebagai ordered set: urutan = urutan spawn meteor
+        self.meteors = {}
+        self.ends = {}
+
+class TargetIndex:
+    def __init__(self):
+        self.root = TrieNode()
+        self.buffer = ""
+        self.path = [self.root]
+        self.highlighted = {}
+
+    def add(self, meteor):
+        node = self.root
+        node.meteors[meteor] = None
+        for ch in meteor.text:
+            child = node.children.get(ch)
+            if child is None:
+                child = TrieNode()
+                node.children[ch] = child
+            node = child
+            node.meteors[meteor] = None
+        node.ends[meteor] = None
+
+        if not self.buffer:
+            return
+        # Path yang putus (None) bisa tersambung lagi lewat meteor baru ini, meski kata barunya
+        # cuma cocok dengan awalan buffer: kalau tidak di-resolve, backspace meninggalkan None di path.
+        if self.path[-1] is None:
+            self._resolve_path()
+        if meteor.text.startswith(self.buffer):
+            self.highlighted[meteor] = None
+            meteor.set_highlight(True)
+
+    def remove(self, meteor):
+        node = self.root
+        node.meteors.pop(meteor, None)
+        pruned = False
+        for ch in meteor.text:
+            child = node.children.get(ch)
+            if child is None:
+                break
+            child.meteors.pop(meteor, None)
+            if not child.meteors:
+                del node.children[ch]
+                pruned = True
+                break
+            node = child
+        else:
+            node.ends.pop(meteor, None)
+
+        self.highlighted.pop(meteor, None)
+        if pruned and self.buffer:
+            self._resolve_path()
+
+    def _resolve_path(self):
+        node = self.root
+        self.path = [node]
+        for ch in self.buffer:
+            node = node.children.get(ch) if node is not None else None
+            self.path.append(node)
+
+    def push(self, ch):
+        self.buffer += ch
+        node = self.path[-1]
+        self.path.append(node.children.get(ch) if node is not None else None)
+        self._refresh_highlight()
+
+    def pop(self):
+        if self.buffer:
+            self.buffer = self.buffer[:-1]
+            self.path.pop()
+            self._refresh_highlight()
+
+    def clear(self):
+        self.buffer = ""
+        self.path = [self.root]
+        self._refresh_highlight()
+
+    def matches(self):
+        node = self.path[-1]
+        if not self.buffer or node is None:
+            return {}
+        return node.meteors
+
+    def locked_target(self):
+        return next(iter(self.matches()), None)
+
+    def exact_hit(self):
+        node = self.path[-1]
+        if not self.buffer or node is None:
+            return None
+        return next(iter(node.ends), None)
+
+    def _refresh_highlight(self):
+        # Cuma meteor yang status match-nya berubah yang disentuh
+        matches = self.matches()
+        for meteor in [m for m in self.highlighted if m not in matches]:
+            del self.highlighted[meteor]
+            meteor.set_highlight(False)
+        for meteor in matches:
+            if meteor not in self.highlighted:
+                self.highlighted[meteor] = None
+                meteor.set_highlight(True)
+
+class GameSimulation:
+    def __init__(self, words=None, stats=None, rng=None, meteor_factory=None, width=WIDTH, height=HEIGHT, seed=None,
+                 difficulty=None):
+        self.dictionary = make_dictionary(words)
+        self.difficulty = difficulty or Difficulty()
+        self.stats = stats if stats is not None else PlayerStats()
+        self.seed = seed
+        streams = RandomStreams(seed)
+        self.rng = rng or streams.stream("sim")
+        # Pilihan kata punya stream sendiri: retry pick() tidak menggeser x/kecepatan meteor berikutnya
+        self.word_rng = streams.stream("words")
+        self.meteor_factory = meteor_factory or SimMeteor
+        self.meteor_pool = EntityPool(self.meteor_factory)
+        self.meteors = EntityStore()
+        self.removed = []
+        self.width = width
+        self.height = height
+        # Event untuk frontend (suara, partikel, teks), dikosongkan lewat drain_events()
+        self.events = []
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+            streams = RandomStreams(seed)
+            self.rng = streams.stream("sim")
+            self.word_rng = streams.stream("words")
+        self.stats.reset_stats()
+        self.level_manager = LevelManager(self.difficulty)
+        for meteor in self.meteors:
+            self.meteor_pool.release(meteor)
+        self.meteors.clear()
+        self.targets = TargetIndex()
+        self.spawn_timer = 0
+        self.tick = 0
+        self.over = False
+        self.hits = 0
+        self.misses = 0
+        self.keystrokes = 0
+        self.correct_keystrokes = 0
+        self.events.clear()
+
+    @property
+    def input_buffer(self):
+        return self.targets.buffer
+
+    @property
+    def elapsed(self):
+        return self.tick * SIM_STEP
+
+    def accuracy(self):
+        if self.keystrokes == 0:
+            return 1.0
+        return self.correct_keystrokes / self.keystrokes
+
+    def drain_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+    def press(self, key):
+        if self.over:
+            return
+        if key == KEY_ENTER:
+            self.panic()
+        elif key == KEY_BACKSPACE:
+            self.backspace()
+        elif key == KEY_ESCAPE:
+            self.abort()
+        elif key.isalpha():
+            self.type_char(key)
+
+    def type_char(self, ch):
+        self.targets.push(ch)
+        self.keystrokes += 1
+        if self.targets.matches():
+            self.correct_keystrokes += 1
+        self.events.append(("type", None))
+
+    def backspace(self):
+        self.targets.pop()
+        self.events.append(("type", None))
+
+    def panic(self):
+        if len(self.targets.buffer) > 0:
+            self.targets.clear()
+            self.stats.add_score(-self.difficulty.panic_penalty)
+            self.stats.reset_streak()
+            self.events.append(("panic", None))
+
+    def abort(self):
+        self.over = True
+        self.events.append(("gameover", None))
+
+    def next_spawn(self):
+        # Tepat dua angka dari stream "sim" per spawn (x, kecepatan)
+        x = self.rng.randint(50, self.width - 150)
+        speed = self.rng.uniform(self.difficulty.speed_min, self.difficulty.speed_max) + self.level_manager.get_speed_multiplier()
+        # Huruf depan meteor yang masih di layar = anak root trie target
+        word = self.dictionary.pick(self.level_manager.level, self.word_rng, self.targets.root.children)
+        return word, x, speed
+
+    def spawn_meteor(self):
+        word, x, speed = self.next_spawn()
+        meteor = self.meteor_pool.acquire(word, x, speed)
+        self.meteors.add(meteor)
+        self.targets.add(meteor)
+        return meteor
+
+    def step(self):
+        if self.over:
+            return
+        self.tick += 1
+
+        if self.level_manager.check_level_up(self.stats.score):
+            self.events.append(("levelup", self.level_manager.level))
+
+        self.spawn_timer += 1
+        if self.spawn_timer > self.level_manager.get_spawn_delay():
+            self.spawn_meteor()
+            self.spawn_timer = 0
+
+        # List dipakai ulang tiap tick, bukan dibuat baru
+        meteors_to_remove = self.removed
+        hit = self.targets.exact_hit()
+        difficulty = self.difficulty
+
+        for meteor in self.meteors:
+            meteor.update()
+
+            if meteor is hit:
+                meteors_to_remove.append(meteor)
+
+                self.stats.add_score(difficulty.hit_score)
+                self.hits += 1
+                if self.stats.increment_streak(difficulty.streak_bonus_every):
+                    self.stats.heal(difficulty.streak_heal)
+                    self.events.append(("streak_bonus", meteor))
+                self.events.append(("hit", meteor))
+
+            elif meteor.y > self.height:
+                meteors_to_remove.append(meteor)
+
+                self.stats.take_damage(difficulty.meteor_damage)
+                self.misses += 1
+                self.events.append(("damage", meteor))
+
+        # Meteor kembali ke pool; event "hit"/"damage" harus sudah diproses sebelum step berikutnya
+        for m in meteors_to_remove:
+            if self.meteors.remove(m):
+                self.targets.remove(m)
+                self.meteor_pool.release(m)
+        meteors_to_remove.clear()
+
+        if hit is not None:
+            self.targets.clear()
+
+        if not self.stats.is_alive():
+            self.over = True
+            self.events.append(("gameover", None))
+
+    def advance_to(self, tick):
+        while self.tick < tick and not self.over:
+            self.step()
+
+    def feed(self, key_events):
+        # key_events: (waktu_detik, key) urut waktu; key diterapkan sebelum tick berikutnya
+        for t, key in key_events:
+            self.advance_to(int(t * SIM_HZ))
+            if self.over:
+                break
+            self.press(key)
+            self.events.clear()
+
+    def result(self):
+        return {
+            "score": self.stats.score,
+            "level": self.level_manager.level,
+            "ticks": self.tick,
+            "seconds": self.elapsed,
+            "hits": self.hits,
+            "misses": self.misses,
+            "keystrokes": self.keystrokes,
+            "accuracy": self.accuracy(),
+            "max_streak": self.stats.max_streak,
+        }
+
+class BotTypist:
+    def __init__(self, wpm=60, accuracy=0.95, reaction=0.25, rng=None):
+        self.wpm = wpm
+        self.accuracy = accuracy
+        self.reaction_ticks = int(reaction * SIM_HZ)
+        self.rng = rng or random.Random()
+        # 1 kata = 5 karakter
+        self.key_interval = SIM_HZ * 60.0 / (wpm * 5)
+        self.next_key_tick = 0.0
+
+    def choose_target(self, sim):
+        target = sim.targets.locked_target()
+        if target is not None:
+            return target
+        visible = [m for m in sim.meteors if m.y > -60 + m.base_speed * self.reaction_ticks]
+        if not visible:
+            return None
+        return max(visible, key=lambda m: m.y)
+
+    def act(self, sim):
+        if sim.tick < self.next_key_tick:
+            return None
+        target = self.choose_target(sim)
+        if target is None:
+            return None
+        self.next_key_tick = sim.tick + self.key_interval
+
+        buffer = sim.input_buffer
+        if not target.text.startswith(buffer):
+            return KEY_BACKSPACE
+        if len(buffer) >= len(target.text):
+            return None
+        if self.rng.random() > self.accuracy:
+            return self.rng.choice("abcdefghijklmnopqrstuvwxyz")
+        return target.text[len(buffer)]
+
+def run_session(bot, seed=None, max_seconds=600, words=None, difficulty=None):
+    sim = GameSimulation(words=words, seed=seed, difficulty=difficulty)
+    max_ticks = int(max_seconds * SIM_HZ)
+    while not sim.over and sim.tick < max_ticks:
+        key = bot.act(sim)
+        if key is not None:
+            sim.press(key)
+        sim.step()
+        sim.events.clear()
+    return sim.result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless CYBER TYPER simulation")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--wpm", type=float, default=60)
+    parser.add_argument("--accuracy", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-seconds", type=float, default=600)
+    parser.add_argument("--words", help="word dictionary built with dictionary.py (default: built-in word list)")
+    args = parser.parse_args()
+
+    words = WordDictionary.load(args.words) if args.words else None
+
+    start = time.perf_counter()
+    results = []
+    for i in range(args.sessions):
+        bot = BotTypist(args.wpm, args.accuracy, rng=random.Random(args.seed * 100003 + i))
+        results.append(run_session(bot, seed=args.seed + i, max_seconds=args.max_seconds, words=words))
+    elapsed = time.perf_counter() - start
+
+    scores = sorted(r["score"] for r in results)
+    survival = sorted(r["seconds"] for r in results)
+    played = sum(r["seconds"] for r in results)
+    print(f"[SIM] {args.sessions} sessions in {elapsed:.2f}s ({args.sessions / elapsed:.0f} sessions/s, "
+          f"{played / elapsed:.0f}x real time)")
+    print(f"[SIM] score    median {scores[len(scores) // 2]}  max {scores[-1]}")
+    print(f"[SIM] survival median {survival[len(survival) // 2]:.1f}s  max {survival[-1]:.1f}s")
+
+if __name__ == "__main__":
+    main()
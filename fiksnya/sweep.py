@@ -0,0 +1,143 @@
+import os
+import csv
+import json
+import time
+import random
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+from analytics import percentile
+from simulation import BotTypist, Difficulty, DIFFICULTY_DEFAULTS, run_session
+
+# Sweep kurva kesulitan: banyak sesi headless dengan bot, dibagi ke semua core lewat ProcessPoolExecutor
+
+# Sesi per job: cukup besar supaya overhead pickle/IPC kecil, cukup kecil supaya beban tiap core rata
+CHUNK_SIZE = 20
+
+_worker_words = None
+
+def init_worker(words_path):
+    # Kamus dibuka sekali per proses worker (mmap, jadi halaman file dipakai bareng antar proses)
+    global _worker_words
+    if words_path:
+        from dictionary import WordDictionary
+        _worker_words = WordDictionary.load(words_path)
+
+def run_chunk(config_index, params, wpm, accuracy, seeds, max_seconds):
+    difficulty = Difficulty(**params)
+    results = []
+    for seed in seeds:
+        bot = BotTypist(wpm, accuracy, rng=random.Random(seed * 7919 + 1))
+        r = run_session(bot, seed=seed, max_seconds=max_seconds, words=_worker_words, difficulty=difficulty)
+        results.append((r["seconds"], r["score"], r["level"]))
+    return config_index, results
+
+def parse_grid(parser, specs):
+    # "spawn_delay_base=80,90,100" -> ("spawn_delay_base", [80, 90, 100])
+    grid = []
+    for spec in specs or []:
+        name, _, values = spec.partition("=")
+        if name not in DIFFICULTY_DEFAULTS or not values:
+            parser.error(f"bad --set '{spec}', known parameters: {', '.join(DIFFICULTY_DEFAULTS)}")
+        kind = type(DIFFICULTY_DEFAULTS[name])
+        try:
+            grid.append((name, [kind(v) for v in values.split(",")]))
+        except ValueError:
+            parser.error(f"bad --set '{spec}', {name} takes {kind.__name__} values")
+    return grid
+
+def build_configs(grid, wpms, accuracies):
+    names = [name for name, _ in grid]
+    configs = []
+    for values in itertools.product(*[values for _, values in grid]):
+        params = dict(zip(names, values))
+        for wpm in wpms:
+            for accuracy in accuracies:
+                configs.append({"params": params, "wpm": wpm, "accuracy": accuracy})
+    return configs
+
+def summarize(results, max_seconds):
+    survival = sorted(r[0] for r in results)
+    scores = sorted(r[1] for r in results)
+    levels = [r[2] for r in results]
+    summary = {"sessions": len(results), "capped": sum(1 for s in survival if s >= max_seconds)}
+    for pct in (10, 50, 90):
+        summary[f"survival_p{pct}"] = percentile(survival, pct)
+        summary[f"score_p{pct}"] = percentile(scores, pct)
+    summary["mean_level"] = sum(levels) / len(levels)
+    return summary
+
+def histogram(values, bins=10):
+    lo, hi = min(values), max(values)
+    width = (hi - lo) / bins or 1
+    counts = [0] * bins
+    for v in values:
+        counts[min(bins - 1, int((v - lo) / width))] += 1
+    return {"min": lo, "bin_width": width, "counts": counts}
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep CYBER TYPER difficulty parameters with headless bot sessions")
+    parser.add_argument("--set", action="append", metavar="PARAM=V1,V2", help="difficulty parameter values to sweep (repeatable)")
+    parser.add_argument("--wpm", type=float, nargs="+", default=[40, 60, 80])
+    parser.add_argument("--accuracy", type=float, nargs="+", default=[0.95])
+    parser.add_argument("--sessions", type=int, default=200, help="sessions per configuration")
+    parser.add_argument("--max-seconds", type=float, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--words", help="word dictionary built with dictionary.py")
+    parser.add_argument("--out", help="write per-configuration summaries to a .csv or .json file")
+    args = parser.parse_args()
+
+    grid = parse_grid(parser, args.set)
+    configs = build_configs(grid, args.wpm, args.accuracy)
+    results = [[] for _ in configs]
+
+    # Seed sama untuk tiap konfigurasi: perbedaan hasil murni dari parameter, bukan dari keberuntungan
+    seeds = [args.seed * 1000003 + i for i in range(args.sessions)]
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, len(seeds), CHUNK_SIZE)]
+    total = len(configs) * args.sessions
+    print(f"[SWEEP] {len(configs)} configurations x {args.sessions} sessions = {total} sessions on {args.workers} workers")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(args.words,)) as pool:
+        futures = [pool.submit(run_chunk, i, c["params"], c["wpm"], c["accuracy"], chunk, args.max_seconds)
+                   for i, c in enumerate(configs) for chunk in chunks]
+        for future in futures:
+            index, chunk_results = future.result()
+            results[index].extend(chunk_results)
+    elapsed = time.perf_counter() - start
+    print(f"[SWEEP] {total} sessions in {elapsed:.1f}s ({total / elapsed:.0f} sessions/s, {total / elapsed / args.workers:.0f} per worker)")
+
+    names = [name for name, _ in grid]
+    header = "".join(f"{n:>18}" for n in names) + f"{'wpm':>6}{'acc':>6}{'surv p10':>10}{'p50':>8}{'p90':>8}{'score p10':>11}{'p50':>7}{'p90':>7}{'level':>7}"
+    print(header)
+    rows = []
+    for config, config_results in zip(configs, results):
+        summary = summarize(config_results, args.max_seconds)
+        row = dict(config["params"], wpm=config["wpm"], accuracy=config["accuracy"], **summary)
+        row["survival_hist"] = histogram([r[0] for r in config_results])
+        row["score_hist"] = histogram([r[1] for r in config_results])
+        rows.append(row)
+        line = "".join(f"{config['params'][n]:>18}" for n in names)
+        line += (f"{config['wpm']:>6.0f}{config['accuracy']:>6.2f}{summary['survival_p10']:>10.1f}{summary['survival_p50']:>8.1f}"
+                 f"{summary['survival_p90']:>8.1f}{summary['score_p10']:>11}{summary['score_p50']:>7}{summary['score_p90']:>7}"
+                 f"{summary['mean_level']:>7.1f}")
+        if summary["capped"]:
+            line += f"  ({summary['capped']} hit --max-seconds)"
+        print(line)
+
+    if args.out:
+        if args.out.endswith(".json"):
+            with open(args.out, "w") as f:
+                json.dump({"defaults": DIFFICULTY_DEFAULTS, "max_seconds": args.max_seconds, "results": rows}, f, indent=2)
+        else:
+            fields = [k for k in rows[0] if not k.endswith("_hist")]
+            with open(args.out, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(rows)
+        print(f"[SWEEP] Results saved: {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import sys
+import random
+import argparse
+
+from simulation import TargetIndex, SimMeteor
+
+# Cek TargetIndex (trie) terhadap pencarian brute-force startswith pada operasi acak:
+# spawn, meteor hilang, ketik, backspace, clear. Keluar dengan kode 1 kalau ada yang beda.
+
+# Alfabet kecil supaya awalan sering bertabrakan, termasuk kasus typo lalu backspace
+LETTERS = "pyxsr"
+
+def random_word(rng):
+    return "".join(rng.choice(LETTERS) for _ in range(rng.randint(1, 5)))
+
+def check_state(index, live):
+    buffer = index.buffer
+    expected = {m for m in live if buffer and m.text.startswith(buffer)}
+    matches = set(index.matches())
+    if matches != expected:
+        return f"matches {sorted(m.text for m in matches)} != {sorted(m.text for m in expected)}"
+    if set(index.highlighted) != expected:
+        return f"highlighted {sorted(m.text for m in index.highlighted)} != {sorted(m.text for m in expected)}"
+    exact = index.exact_hit()
+    exact_expected = [m for m in live if buffer and m.text == buffer]
+    if (exact is None) != (not exact_expected) or (exact is not None and exact not in exact_expected):
+        return f"exact_hit {exact.text if exact else None} for buffer '{buffer}'"
+    return None
+
+def run_trial(rng, steps):
+    index = TargetIndex()
+    live = []
+    log = []
+    for _ in range(steps):
+        op = rng.random()
+        if op < 0.25:
+            meteor = SimMeteor(random_word(rng), 0, 1.0)
+            live.append(meteor)
+            index.add(meteor)
+            log.append(f"add {meteor.text}")
+        elif op < 0.4 and live:
+            meteor = live.pop(rng.randrange(len(live)))
+            index.remove(meteor)
+            log.append(f"remove {meteor.text}")
+        elif op < 0.75:
+            ch = rng.choice(LETTERS)
+            index.push(ch)
+            log.append(f"type {ch}")
+        elif op < 0.95:
+            index.pop()
+            log.append("backspace")
+        else:
+            index.clear()
+            log.append("clear")
+        error = check_state(index, live)
+        if error:
+            return error, log
+    return None, log
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare TargetIndex against a brute-force prefix scan")
+    parser.add_argument("--trials", type=int, default=3000)
+    parser.add_argument("--steps", type=int, default=60, help="random operations per trial")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failures = 0
+    for trial in range(args.trials):
+        error, log = run_trial(random.Random(args.seed * 1000003 + trial), args.steps)
+        if error:
+            failures += 1
+            if failures == 1:
+                print(f"[CHECK] Trial {trial}: {error}")
+                print(f"[CHECK]   after: {', '.join(log[-12:])}")
+    if failures:
+        print(f"[CHECK] TargetIndex disagrees with brute force in {failures} of {args.trials} trials")
+        sys.exit(1)
+    print(f"[CHECK] TargetIndex matches brute force in all {args.trials} trials")
+
+if __name__ == "__main__":
+    main()